@@ -8,3 +8,68 @@ DEFAULT_BALANCE = 1000.00
 RESERVED_USERNAMES = {'SYSTEM', 'ADMIN', 'ROOT', 'DAEMON', 'GUEST'}
 AES_KEY_SIZE = 32
 AES_IV_SIZE = 16
+KEY_CACHE_SIZE = 256  # parsed keys (with their signer/cipher objects) kept in memory
+VERIFIED_CACHE_SIZE = 4096  # certificates whose CA signature already checked out
+
+# Signature algorithms: 'RSA', 'Ed25519' or 'ECDSA-P256'
+WALLET_KEY_ALGORITHM = 'RSA'  # for newly generated wallet keys; existing keystores keep theirs
+CA_KEY_ALGORITHM = 'RSA'  # for a newly generated CA root key; an existing ca_key.pem keeps its own
+
+# Server
+SERVER_MODE = 'threaded'  # 'threaded' (thread per connection) or 'asyncio' (single event loop)
+SERVER_BACKLOG = 1024
+SERVER_MAX_CONNECTIONS = 4096
+SERVER_EXECUTOR_WORKERS = 8
+SERVER_READ_TIMEOUT = 30  # idle keep-alive timeout per connection
+SERVER_MAX_PIPELINE = 32  # in-flight requests per connection (asyncio mode)
+MAX_BLOCKS_PER_REQUEST = 500  # page size cap for GET_BLOCKS
+SUBSCRIBER_QUEUE_SIZE = 1000  # undelivered block headers before a slow subscriber is dropped
+SUBSCRIBER_HEARTBEAT = 15  # seconds between keep-alive frames on an idle subscription
+
+# Wire protocol
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Client
+CLIENT_POOL_SIZE = 4
+CLIENT_REQUEST_TIMEOUT = 120
+
+# Mempool / block assembly
+MEMPOOL_MAX_BLOCK_TXS = 100  # transactions per mined block
+MEMPOOL_MAX_BLOCK_AGE = 2.0  # seconds a transaction may wait before a partial block is mined
+MEMPOOL_MAX_SIZE = 100000
+MEMPOOL_LOG_FILE = 'data/mempool.log'  # accepted transactions not yet mined, replayed on load
+MEMPOOL_LOG_COMPACT_EVERY = 1000  # rewrite the log to just the pending entries once this many are mined
+
+# Storage backend
+STORAGE_BACKEND = 'json'  # 'json' (one file per store, rewritten on change) or 'sqlite' (row-level writes)
+SQLITE_DB_FILE = 'data/bank.db'
+
+# Ledger persistence
+LEDGER_FORMAT = 'json'  # 'json' (ledger.json + append log) or 'binary' (memory-mapped ledger.dat + ledger.idx)
+LEDGER_LOG_FILE = 'data/ledger.log'
+LEDGER_COMPACT_EVERY = 500  # appended blocks before the log is folded into ledger.json
+LEDGER_DATA_FILE = 'data/ledger.dat'
+LEDGER_INDEX_FILE = 'data/ledger.idx'
+LEDGER_CACHE_BLOCKS = 1024  # decoded blocks kept in memory with the binary ledger
+CHECKPOINT_FILE = 'data/ledger.checkpoint.json'
+ACCOUNT_STATE_FILE = 'data/account_state.json'
+ACCOUNT_SNAPSHOT_EVERY = 100  # blocks applied between balance snapshots
+
+# Cold storage tiering (JSON ledger format)
+LEDGER_HOT_BLOCKS = 0  # recent blocks kept in ledger.json and memory; older ones are sealed into segments (0 = off)
+LEDGER_SEGMENT_BLOCKS = 1000  # blocks per sealed segment
+LEDGER_SEGMENT_DIR = 'data/segments'
+LEDGER_SEGMENT_CACHE = 2  # decompressed segments kept in memory
+
+# Proof-of-work
+MINING_WORKERS = 1  # >1 splits the nonce space across that many processes; 0 = one per CPU core
+VERIFY_WORKERS = 0  # processes for full-chain audits; 0 = one per CPU core, 1 = serial
+
+# Transaction signature verification
+SIGNATURE_WORKERS = 0  # processes for batch signature verifies; 0 = one per CPU core, 1 = on the calling thread
+SIGNATURE_BATCH_MIN = 16  # smaller batches are verified on the calling thread
+
+# Sessions
+SESSION_KEY_TTL = 1800  # seconds a key derived at login stays cached
+SESSION_KEY_IDLE = 300  # seconds without use before a session key is dropped
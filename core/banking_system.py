@@ -1,13 +1,13 @@
 import hashlib
 import os
-import time
 import json
 from infosec_banking.models.user_manager import UserManager
 from infosec_banking.models.blockchain import Blockchain
 from infosec_banking.models.transaction import Transaction
 from infosec_banking.crypto.crypto_manager import CryptoManager
+from infosec_banking.crypto.ca import CertificateAuthority
 from infosec_banking.storage.storage_manager import StorageManager
-from infosec_banking.utils.colors import print_header, print_processing, print_success, print_error
+from infosec_banking.utils.colors import print_header, print_processing, print_success, print_error, pause
 
 def _mask_account(account_id: str) -> str:
     """Masks an account ID for privacy"""
@@ -24,7 +24,7 @@ class BankingSystem:
     
     def __init__(self):
         self.user_manager = UserManager()
-        self.blockchain = Blockchain()
+        self.blockchain = Blockchain(CertificateAuthority())
 
     def get_logged_in_user(self):
         """Returns logged in user"""
@@ -34,23 +34,23 @@ class BankingSystem:
         """Executes transaction flow"""
         print_header(f"Processing {type.upper()}")
         
-        print_processing("Step 1: Verifying password...")
-        time.sleep(0.1)
+        print_processing("Step 1: Verifying password...", step=1, steps=8)
+        pause(0.1)
         
         if not self.user_manager.verify_password(user_id, password):
             print_error("Invalid password")
             StorageManager.log_operation(user_id, f"Failed {type}: invalid password", "FAIL")
             return False, "Invalid password."
 
-        print_processing("Step 2: Validating transaction...")
-        time.sleep(0.1)
+        print_processing("Step 2: Validating transaction...", step=2, steps=8)
+        pause(0.1)
         if type in ('withdraw', 'transfer') and self.user_manager.get_balance(user_id) < amount:
             print_error(f"Insufficient balance (Have: ${self.user_manager.get_balance(user_id):.2f}, Need: ${amount:.2f})")
             StorageManager.log_operation(user_id, f"Failed {type}: insufficient funds", "FAIL")
             return False, "Insufficient balance."
         
-        print_processing("Step 3: Preparing transaction record...")
-        time.sleep(0.1)
+        print_processing("Step 3: Preparing transaction record...", step=3, steps=8)
+        pause(0.1)
         tx_id = hashlib.sha256(os.urandom(8)).hexdigest()[:16]
         from_id = user_id if type != 'deposit' else 'SYSTEM'
         final_to_id = to_id if type != 'withdraw' else 'SYSTEM'
@@ -59,27 +59,27 @@ class BankingSystem:
         tx_json = _canonical_json(tx.to_dict())
         print_success(f"Transaction ID: {tx_id}")
         
-        print_processing("Step 4: Deriving encryption key...")
-        time.sleep(0.1)
-        key_bytes = CryptoManager.derive_key(password)
+        print_processing("Step 4: Loading encryption key...", step=4, steps=8)
+        pause(0.1)
+        key_bytes = self.user_manager.session_key(user_id, password)
         
-        print_processing("Step 5: Encrypting transaction...")
-        time.sleep(0.1)
+        print_processing("Step 5: Encrypting transaction...", step=5, steps=8)
+        pause(0.1)
         encrypted_tx_bytes = CryptoManager.encrypt(tx_json, key_bytes)
         
-        print_processing("Step 6: Creating transaction hash...")
-        time.sleep(0.1)
+        print_processing("Step 6: Creating transaction hash...", step=6, steps=8)
+        pause(0.1)
         encrypted_tx_hex = encrypted_tx_bytes.hex()
         tx_hash = hashlib.sha256(encrypted_tx_bytes).hexdigest()
         print_success(f"TX Hash: {tx_hash[:16]}...")
 
-        print_processing("Step 7: Creating and mining block...")
-        time.sleep(0.1)
+        print_processing("Step 7: Creating and mining block...", step=7, steps=8)
+        pause(0.1)
         account_mask = _mask_account(user_id)
         block_index = self.blockchain.add_block(account_mask, encrypted_tx_hex, tx_hash)
 
-        print_processing("Step 8: Updating balances...")
-        time.sleep(0.1)
+        print_processing("Step 8: Updating balances...", step=8, steps=8)
+        pause(0.1)
         if type == 'deposit':
             self.user_manager.update_balance(user_id, amount)
             print_success(f"Added ${amount:.2f}")
@@ -93,11 +93,11 @@ class BankingSystem:
             if not self.user_manager.update_balance(to_id, amount):
                 print_error("Receiver balance update failed - ROLLING BACK")
                 self.user_manager.update_balance(user_id, amount)
-                self.user_manager.save()
+                self.user_manager.save(user_id)
                 return False, "Transfer failed at receiver update."
             print_success(f"${amount:.2f} transferred from {user_id} to {to_id}")
         
-        self.user_manager.save()
+        self.user_manager.save(user_id, to_id)
         print_success(f"Transaction complete in Block #{block_index}")
         StorageManager.log_operation(user_id, f"{type}: ${amount:.2f}", "SUCCESS")
         return True, f"Success! Block #{block_index}"
@@ -137,58 +137,59 @@ class BankingSystem:
             print_error("Invalid password")
             return None, "Invalid password"
 
-        print_processing("Deriving encryption key...")
-        time.sleep(0.1)
-        key_bytes = CryptoManager.derive_key(password)
+        print_processing("Loading encryption key...")
+        pause(0.1)
+        key_bytes = self.user_manager.session_key(user_id, password)
         history = []
         
         print_processing("Scanning ledger...")
-        time.sleep(0.2)
+        pause(0.2)
 
-        for block in self.blockchain.chain:
+        for block in self.blockchain.get_account_blocks(_mask_account(user_id)):
             if block.index == 0:
                 continue
             
-            if not block.account_mask == _mask_account(user_id):
-                continue 
+            for account_mask, encrypted_tx_hex, tx_hash in block.entries():
+                if not account_mask == _mask_account(user_id):
+                    continue 
 
-            is_valid_tx_hash = False
-            decrypted_tx = None
+                is_valid_tx_hash = False
+                decrypted_tx = None
             
-            try:
-                encrypted_tx_bytes = bytes.fromhex(block.encrypted_tx_hex)
-                computed_tx_hash = hashlib.sha256(encrypted_tx_bytes).hexdigest()
-                if computed_tx_hash != block.tx_hash:
-                    raise Exception("Hash mismatch")
-                is_valid_tx_hash = True
+                try:
+                    encrypted_tx_bytes = bytes.fromhex(encrypted_tx_hex)
+                    computed_tx_hash = hashlib.sha256(encrypted_tx_bytes).hexdigest()
+                    if computed_tx_hash != tx_hash:
+                        raise Exception("Hash mismatch")
+                    is_valid_tx_hash = True
                 
-                decrypted_json_str = CryptoManager.decrypt(encrypted_tx_bytes, key_bytes)
-                decrypted_tx = json.loads(decrypted_json_str)
+                    decrypted_json_str = CryptoManager.decrypt(encrypted_tx_bytes, key_bytes)
+                    decrypted_tx = json.loads(decrypted_json_str)
 
-            except Exception as e:
-                status = f"ERROR: {str(e)[:30]}"
-                decrypted_tx = {"memo": "Decryption failed"}
-                is_valid_tx_hash = False
+                except Exception as e:
+                    status = f"ERROR: {str(e)[:30]}"
+                    decrypted_tx = {"memo": "Decryption failed"}
+                    is_valid_tx_hash = False
             
-            status = "[OK] Valid" if is_valid_tx_hash else "[X] Tampered"
+                status = "[OK] Valid" if is_valid_tx_hash else "[X] Tampered"
             
-            history.append({
-                'block_index': block.index,
-                'status': status,
-                'tx_id': decrypted_tx.get('tx_id', 'N/A')[:8],
-                'type': decrypted_tx.get('type', 'N/A'),
-                'amount': decrypted_tx.get('amount', 0.0),
-                'from': decrypted_tx.get('from_id', 'N/A'),
-                'to': decrypted_tx.get('to_id', 'N/A'),
-                'memo': decrypted_tx.get('memo', '')[:20],
-            })
+                history.append({
+                    'block_index': block.index,
+                    'status': status,
+                    'tx_id': decrypted_tx.get('tx_id', 'N/A')[:8],
+                    'type': decrypted_tx.get('type', 'N/A'),
+                    'amount': decrypted_tx.get('amount', 0.0),
+                    'from': decrypted_tx.get('from_id', 'N/A'),
+                    'to': decrypted_tx.get('to_id', 'N/A'),
+                    'memo': decrypted_tx.get('memo', '')[:20],
+                })
 
         print_success(f"Found {len(history)} transactions\n")
         return history, ""
 
-    def verify_chain(self):
-        """Verifies blockchain"""
-        is_valid, index = self.blockchain.is_valid(verbose=True)
+    def verify_chain(self, full=False):
+        """Verifies blockchain (full=True re-audits every block, ignoring the checkpoint)"""
+        is_valid, index = self.blockchain.is_valid(verbose=True, full=full)
         if is_valid:
             print_success("Ledger is secure and unmodified")
         else:
@@ -1,25 +1,213 @@
 import socket
-import pickle
+import threading
+import itertools
 import sys
 import os
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from infosec_banking.core.protocol import send_message, recv_message, configure_socket
+from infosec_banking.config import CLIENT_POOL_SIZE, CLIENT_REQUEST_TIMEOUT, SUBSCRIBER_HEARTBEAT
+
+class _PendingResponse:
+    """Slot filled by the connection's reader thread when the response arrives"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+
+    def set(self, response):
+        self.response = response
+        self.event.set()
+
+    def wait(self, timeout):
+        if not self.event.wait(timeout):
+            return {"status": "error", "message": "Request timed out"}
+        return self.response
+
+class _Connection:
+    """Persistent socket that can carry several in-flight requests at once.
+
+    Requests are tagged with a request_id; a reader thread matches each
+    response back to its waiting caller, so responses may arrive in any order.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, host, port):
+        self.sock = socket.create_connection((host, port))
+        configure_socket(self.sock)
+        self.send_lock = threading.Lock()
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.closed = False
+        self.reader = threading.Thread(target=self._read_loop, daemon=True)
+        self.reader.start()
+
+    @property
+    def in_flight(self):
+        return len(self.pending)
+
+    def submit(self, request):
+        """Sends a request and returns a _PendingResponse for it"""
+        request_id = next(self._ids)
+        slot = _PendingResponse()
+        with self.pending_lock:
+            if self.closed:
+                raise ConnectionError("Connection closed")
+            self.pending[request_id] = slot
+        try:
+            with self.send_lock:
+                send_message(self.sock, dict(request, request_id=request_id))
+        except Exception:
+            with self.pending_lock:
+                self.pending.pop(request_id, None)
+            self.close()
+            raise
+        return slot
+
+    def _read_loop(self):
+        try:
+            while True:
+                response = recv_message(self.sock)
+                if response is None:
+                    break
+                with self.pending_lock:
+                    slot = self.pending.pop(response.pop('request_id', None), None)
+                if slot is not None:
+                    slot.set(response)
+        except Exception:
+            pass
+        self.close()
+
+    def close(self):
+        with self.pending_lock:
+            self.closed = True
+            pending, self.pending = self.pending, {}
+        for slot in pending.values():
+            slot.set({"status": "error", "message": "Server closed the connection"})
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class ConnectionPool:
+    """Keep-alive pool of up to `size` connections to one server"""
+
+    def __init__(self, host, port, size=CLIENT_POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Returns the least-busy open connection, opening a new one if all are busy"""
+        with self.lock:
+            self.connections = [c for c in self.connections if not c.closed]
+            idle = min(self.connections, key=lambda c: c.in_flight, default=None)
+            if idle is not None and (idle.in_flight == 0 or len(self.connections) >= self.size):
+                return idle
+        conn = _Connection(self.host, self.port)
+        with self.lock:
+            self.connections.append(conn)
+        return conn
+
+    def submit(self, request):
+        conn = self.acquire()
+        try:
+            return conn.submit(request)
+        except (BrokenPipeError, ConnectionResetError, ConnectionError):
+            # Reused socket went stale (e.g. server idle timeout); the request
+            # never left this host, so it is safe to retry on a fresh one.
+            conn = _Connection(self.host, self.port)
+            with self.lock:
+                self.connections.append(conn)
+            return conn.submit(request)
+
+    def close(self):
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for conn in connections:
+            conn.close()
+
 class BankingClient:
-    def __init__(self, host='127.0.0.1', port=5005):
+    def __init__(self, host='127.0.0.1', port=5005, pool_size=CLIENT_POOL_SIZE):
         self.host = host
         self.port = port
+        self.pool = ConnectionPool(host, port, pool_size)
 
-    def send_request(self, request):
+    def send_request(self, request, timeout=CLIENT_REQUEST_TIMEOUT):
         try:
-            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client.connect((self.host, self.port))
-            client.send(pickle.dumps(request))
-            response = pickle.loads(client.recv(16384))
-            client.close()
-            return response
+            return self.pool.submit(request).wait(timeout)
         except ConnectionRefusedError:
             return {"status": "error", "message": "Connection refused. Is the server running?"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
+
+    def send_requests(self, requests, timeout=CLIENT_REQUEST_TIMEOUT):
+        """Pipelines several requests and returns their responses in order"""
+        slots = []
+        for request in requests:
+            try:
+                slots.append(self.pool.submit(request))
+            except ConnectionRefusedError:
+                slots.append({"status": "error", "message": "Connection refused. Is the server running?"})
+            except Exception as e:
+                slots.append({"status": "error", "message": str(e)})
+        return [s if isinstance(s, dict) else s.wait(timeout) for s in slots]
+
+    def sync_chain(self, chain):
+        """Appends blocks the server has beyond the local `chain` list (of block dicts).
+
+        Only new blocks are downloaded. If the server's chain no longer links to
+        the local tip, the local copy is discarded and fetched again from genesis.
+        Returns (success, message).
+        """
+        while True:
+            resp = self.send_request({"action": "GET_BLOCKS", "since": len(chain)})
+            if resp.get('status') != 'success':
+                return False, resp.get('message', 'Unknown error')
+
+            blocks = resp['blocks']
+            if blocks and chain and blocks[0]['previous_hash'] != chain[-1]['hash']:
+                del chain[:]
+                continue
+            if not blocks and resp['height'] < len(chain):
+                del chain[:] # Server chain is shorter than ours: resync
+                continue
+
+            chain.extend(blocks)
+            if not blocks or len(chain) >= resp['height']:
+                return True, ""
+
+    def subscribe_blocks(self, since=None):
+        """Yields block headers pushed by the server as blocks are appended.
+
+        Uses a dedicated connection outside the pool. With `since`, headers from
+        that index up to the current tip are sent first. The generator returns
+        if the server drops the subscription (e.g. the client fell too far
+        behind); callers should resync with sync_chain() and subscribe again.
+        """
+        sock = socket.create_connection((self.host, self.port))
+        configure_socket(sock)
+        # Server heartbeats arrive every SUBSCRIBER_HEARTBEAT seconds when idle
+        sock.settimeout(SUBSCRIBER_HEARTBEAT * 3)
+        try:
+            send_message(sock, {"action": "SUBSCRIBE_BLOCKS", "since": since})
+            ack = recv_message(sock)
+            if ack is None or ack.get('status') != 'success':
+                raise ConnectionError((ack or {}).get('message', "Subscription refused"))
+
+            while True:
+                message = recv_message(sock)
+                if message is None or message.get('event') == 'overflow':
+                    return
+                if message.get('event') == 'block':
+                    yield message['block']
+        finally:
+            sock.close()
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,108 @@
+import pickle
+import socket
+import struct
+import asyncio
+from infosec_banking.config import MAX_MESSAGE_SIZE, STREAM_CHUNK_SIZE
+
+# Every message on the wire is a 4-byte big-endian payload length followed by
+# the pickled payload. Large payloads are written in STREAM_CHUNK_SIZE slices.
+HEADER = struct.Struct('!I')
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed or oversized frame"""
+
+def encode_message(obj):
+    """Pickles a message and returns (header, payload)"""
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message too large ({len(payload)} bytes)")
+    return HEADER.pack(len(payload)), payload
+
+def _check_length(length):
+    if length > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Frame of {length} bytes exceeds limit of {MAX_MESSAGE_SIZE}")
+
+def configure_socket(sock):
+    """Disables Nagle so small request/response frames are not delayed"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+def send_message(sock, obj):
+    """Sends one framed message over a blocking socket"""
+    header, payload = encode_message(obj)
+    if len(payload) <= STREAM_CHUNK_SIZE:
+        sock.sendall(header + payload)
+        return
+
+    sock.sendall(header)
+    view = memoryview(payload)
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        sock.sendall(view[offset:offset + STREAM_CHUNK_SIZE])
+
+def _recv_into(sock, view):
+    """Fills the whole view from the socket; returns bytes read before EOF"""
+    received = 0
+    while received < len(view):
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            break
+        received += n
+    return received
+
+def recv_message(sock):
+    """Reads one framed message from a blocking socket.
+
+    Returns None if the peer closed the connection cleanly between frames.
+    """
+    header = bytearray(HEADER.size)
+    got = _recv_into(sock, memoryview(header))
+    if got == 0:
+        return None
+    if got < HEADER.size:
+        raise ConnectionError("Connection closed mid-header")
+
+    (length,) = HEADER.unpack(header)
+    _check_length(length)
+
+    buffer = bytearray(length)
+    if _recv_into(sock, memoryview(buffer)) < length:
+        raise ConnectionError("Connection closed mid-message")
+    return pickle.loads(buffer)
+
+async def read_message(reader, idle_timeout=None):
+    """Reads one framed message from an asyncio StreamReader (None on clean EOF).
+
+    idle_timeout only bounds the wait for the next header, so a timeout never
+    leaves the stream positioned inside a frame.
+    """
+    try:
+        header = await asyncio.wait_for(reader.readexactly(HEADER.size), idle_timeout)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ConnectionError("Connection closed mid-header")
+
+    (length,) = HEADER.unpack(header)
+    _check_length(length)
+
+    try:
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("Connection closed mid-message")
+    return pickle.loads(payload)
+
+async def write_message(writer, obj):
+    """Writes one framed message to an asyncio StreamWriter, draining between chunks"""
+    header, payload = encode_message(obj)
+    if len(payload) <= STREAM_CHUNK_SIZE:
+        writer.write(header + payload)
+        await writer.drain()
+        return
+
+    writer.write(header)
+    view = memoryview(payload)
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        writer.write(view[offset:offset + STREAM_CHUNK_SIZE])
+        await writer.drain()
@@ -1,151 +1,537 @@
 import socket
 import threading
-import pickle
+import hashlib
+import json
+import queue
+import asyncio
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from infosec_banking.models.blockchain import Blockchain
 from infosec_banking.crypto.ca import CertificateAuthority
+from infosec_banking.crypto.batch_verifier import BatchVerifier
 from infosec_banking.models.transaction import Transaction
-from infosec_banking.utils.colors import print_info, print_success, print_error, print_warning
+from infosec_banking.core.protocol import (
+    send_message, recv_message, read_message, write_message, configure_socket, ProtocolError
+)
+from infosec_banking.utils.colors import print_info, print_success, print_error, print_processing, set_reporter, ConsoleReporter
+from infosec_banking.config import (
+    SERVER_MODE, SERVER_BACKLOG, SERVER_MAX_CONNECTIONS,
+    SERVER_EXECUTOR_WORKERS, SERVER_READ_TIMEOUT, SERVER_MAX_PIPELINE, MAX_BLOCKS_PER_REQUEST,
+    SUBSCRIBER_QUEUE_SIZE, SUBSCRIBER_HEARTBEAT
+)
+
+# Actions that sign, verify, mine, read blocks from disk or may build the lookup
+# indexes. In asyncio mode these run on the executor so the event loop keeps
+# serving other sockets.
+BLOCKING_ACTIONS = {'REGISTER', 'SEND_TRANSACTION', 'SEND_TRANSACTIONS', 'GET_CHAIN', 'GET_BLOCKS',
+                    'GET_TX', 'GET_ACCOUNT_BLOCKS', 'GET_TX_STATUS'}
 
 class BankingServer:
-    def __init__(self, host='127.0.0.1', port=5005):
+    def __init__(self, host='127.0.0.1', port=5005, mode=SERVER_MODE):
+        if mode not in ('threaded', 'asyncio'):
+            raise ValueError(f"Unknown server mode: {mode}")
         self.host = host
         self.port = port
+        self.mode = mode
         self.ca = CertificateAuthority()
         self.blockchain = Blockchain(self.ca)
+        self.verifier = BatchVerifier(self.ca)
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.running = False
 
+        # asyncio mode state
+        self.executor = None
+        self._loop = None
+        self._stop_event = None
+        self._connection_slots = None
+        self._connections = {}
+
     def start(self):
         try:
             self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
-            self.running = True
-            print_success(f"Server Listening on {self.host}:{self.port}")
-            
-            while self.running:
-                try:
-                    client_sock, addr = self.server_socket.accept()
-                    client_handler = threading.Thread(
-                        target=self.handle_client,
-                        args=(client_sock,)
-                    )
-                    client_handler.start()
-                except OSError:
-                    break # Socket closed
-                except Exception as e:
-                    if self.running:
-                        print_error(f"Server Accept Error: {e}")
+            self.server_socket.listen(SERVER_BACKLOG)
         except Exception as e:
             print_error(f"Failed to start server on {self.host}:{self.port} - {e}")
             self.running = False
+            return
+
+        # Transactions are mined off the request path
+        self.blockchain.start_miner()
 
-    def handle_client(self, client_sock):
+        if self.mode == 'asyncio':
+            self._start_asyncio()
+        else:
+            self._start_threaded()
+
+    def _start_threaded(self):
+        """Accept loop with one thread per connection"""
+        self.running = True
+        print_success(f"Server Listening on {self.host}:{self.port}")
+
+        while self.running:
+            try:
+                client_sock, addr = self.server_socket.accept()
+                client_handler = threading.Thread(
+                    target=self.handle_client,
+                    args=(client_sock, addr),
+                    daemon=True
+                )
+                client_handler.start()
+            except OSError:
+                break # Socket closed
+            except Exception as e:
+                if self.running:
+                    print_error(f"Server Accept Error: {e}")
+
+    def _start_asyncio(self):
+        """Serves every connection from a single event loop"""
         try:
-            request = pickle.loads(client_sock.recv(16384)) # Increased buffer for certs
-            action = request.get('action')
-            
-            response = {"status": "error", "message": "Invalid action"}
-
-            if action == 'REGISTER':
-                user_id = request['user_id']
-                pub_key = request['public_key']
-                cert = self.ca.issue_certificate(user_id, pub_key)
-                response = {"status": "success", "certificate": cert}
-
-            elif action == 'GET_CERTIFICATE':
-                user_id = request['user_id']
-                # Scan issued certificates
-                # In a real DB this is fast. Here we scan the dict.
-                target_cert = None
-                for cert in self.ca.issued_certificates.values():
-                    if cert.subject == user_id:
-                        target_cert = cert
+            asyncio.run(self._serve_async())
+        except Exception as e:
+            print_error(f"Async server stopped on {self.host}:{self.port} - {e}")
+        finally:
+            self.running = False
+
+    async def _serve_async(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._connection_slots = asyncio.Semaphore(SERVER_MAX_CONNECTIONS)
+        self.executor = ThreadPoolExecutor(
+            max_workers=SERVER_EXECUTOR_WORKERS,
+            thread_name_prefix="banking-worker"
+        )
+
+        server = await asyncio.start_server(self._handle_client_async, sock=self.server_socket)
+        self.running = True
+        print_success(f"Server Listening on {self.host}:{self.port} (asyncio)")
+
+        try:
+            async with server:
+                await self._stop_event.wait()
+                await self._close_connections()
+        finally:
+            self.executor.shutdown(wait=False)
+
+    async def _close_connections(self):
+        """Closes keep-alive connections so their handlers exit on EOF"""
+        handlers = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        if handlers:
+            await asyncio.wait(handlers, timeout=5)
+
+    def handle_client(self, client_sock, addr=None):
+        """Serves requests from one keep-alive connection until it closes or idles out"""
+        try:
+            configure_socket(client_sock)
+            client_sock.settimeout(SERVER_READ_TIMEOUT)
+            while self.running:
+                request = recv_message(client_sock)
+                if request is None:
+                    break
+                if request.get('action') == 'SUBSCRIBE_BLOCKS':
+                    self._stream_blocks(client_sock, request)
+                    break
+                send_message(client_sock, self._dispatch(request, addr))
+        except (socket.timeout, ConnectionError, ProtocolError):
+            pass # Idle, closed or misbehaving client
+        except Exception as e:
+            print_error(f"Handler Error: {e}")
+        finally:
+            client_sock.close()
+
+    async def _handle_client_async(self, reader, writer):
+        addr = writer.get_extra_info('peername')
+        handler = asyncio.current_task()
+        async with self._connection_slots:
+            self._connections[handler] = writer
+            write_lock = asyncio.Lock()
+            pipeline_slots = asyncio.Semaphore(SERVER_MAX_PIPELINE)
+            tasks = set()
+            try:
+                while True:
+                    try:
+                        request = await read_message(reader, SERVER_READ_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        if tasks:
+                            continue # Still answering this client
+                        break
+                    if request is None:
+                        break
+                    if request.get('action') == 'SUBSCRIBE_BLOCKS':
+                        await self._stream_blocks_async(reader, writer, write_lock, request)
                         break
-                
-                if target_cert:
-                    response = {"status": "success", "certificate": target_cert}
-                    print_info(f"Sent Certificate for '{user_id}' to {addr}")
-                else:
-                    response = {"status": "error", "message": "User not found"}
 
-            elif action == 'GET_BALANCE':
-                # Calculate balance by scanning chain
-                user_id = request.get('user_id') # If None, maybe return server stats?
-                if not user_id:
-                     response = {"status": "error", "message": "Missing user_id"}
-                else:
-                    balance = 0.0
-                    for block in self.blockchain.chain:
-                        # Skip genesis
-                        if block.index == 0: continue
-                        
-                        # We need to parse the tx from the block
-                        # In this simplified model, we stored tx_hash as placeholder in 'encrypted_tx_hex'
-                        # But wait, we didn't store the full TX in the block in previous step!
-                        # We only stored the hash!
-                        # We need to fix Blockchain to store the FULL TX DATA if we want to calculate balance!
-                        # Or we store the TX in a separate DB.
-                        # Let's assume the 'encrypted_tx_hex' actually contains the JSON of the TX for this demo.
-                        pass
-                    
-                    # FIX: We need to store the actual transaction in the block to be useful.
-                    # Let's update add_block to take the full tx object/dict.
-                    # For now, return placeholder.
-                    response = {"status": "success", "balance": 1000.0} # Placeholder
-
-            elif action == 'SEND_TRANSACTION':
-                tx_data = request['transaction']
-                tx = Transaction.from_dict(tx_data)
-                
-                print_processing(f"Processing Transaction: {tx.tx_id} ({tx.type})")
-                
-                # Verify
-                if tx.is_valid(self.ca):
-                    # Add to block
-                    # We store the FULL TX DATA in the block now so we can read it back
-                    import json
-                    tx_json = json.dumps(tx.to_dict())
-                    
-                    # Calculate hash
-                    tx_hash = hashlib.sha256(tx_json.encode()).hexdigest()
-                    
-                    self.blockchain.add_block(
-                        account_mask=tx.sender_cert['subject'][:3]+"***",
-                        encrypted_tx_hex=tx_json, # Storing JSON as "encrypted data" for now
-                        tx_hash=tx_hash
+                    await pipeline_slots.acquire()
+                    task = asyncio.create_task(
+                        self._serve_request_async(request, addr, writer, write_lock, pipeline_slots)
                     )
-                    print_success(f"Mined Block #{self.blockchain.last_block.index} - Tx: {tx_hash[:8]}...")
-                    response = {"status": "success", "message": "Transaction Verified & Mined"}
-                else:
-                    print_error(f"Invalid Transaction: {tx.tx_id}")
-                    response = {"status": "error", "message": "Invalid Signature or Certificate"}
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
 
-            elif action == 'GET_CHAIN':
-                response = {"status": "success", "chain": [b.to_dict() for b in self.blockchain.chain]}
+                if tasks:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+            except (ConnectionError, ProtocolError):
+                pass
+            except Exception as e:
+                print_error(f"Handler Error: {e}")
+            finally:
+                self._connections.pop(handler, None)
+                writer.close()
 
-            client_sock.send(pickle.dumps(response))
+    async def _serve_request_async(self, request, addr, writer, write_lock, pipeline_slots):
+        """Runs one pipelined request; responses are written as they complete"""
+        try:
+            if request.get('action') in BLOCKING_ACTIONS:
+                response = await self._loop.run_in_executor(
+                    self.executor, self._dispatch, request, addr
+                )
+            else:
+                response = self._dispatch(request, addr)
+            async with write_lock:
+                await write_message(writer, response)
         except Exception as e:
             print_error(f"Handler Error: {e}")
+        finally:
+            pipeline_slots.release()
+
+    def _subscription_start(self, request):
+        """Returns (ack, backfill headers, next index) for a SUBSCRIBE_BLOCKS request.
+
+        Must be called after the listener is registered so no block is missed;
+        headers that arrive through both paths are dropped by index.
+        """
+        height = self.blockchain.height
+        since = request.get('since')
+        since = height if since is None else max(0, int(since))
+        backfill = [b.header_dict() for b in self.blockchain.get_blocks(since, height)]
+        ack = {"status": "success", "height": height}
+        if 'request_id' in request:
+            ack['request_id'] = request['request_id']
+        return ack, backfill, max(since, height)
+
+    def _stream_blocks(self, client_sock, request):
+        """Pushes block headers to a subscriber until it disconnects (threaded mode)"""
+        events = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        overflow = threading.Event()
+
+        def on_block(block):
             try:
-                client_sock.send(pickle.dumps({"status": "error", "message": str(e)}))
-            except:
-                pass
+                events.put_nowait(block.header_dict())
+            except queue.Full:
+                overflow.set()
+
+        self.blockchain.subscribe(on_block)
+        try:
+            ack, backfill, next_index = self._subscription_start(request)
+            send_message(client_sock, ack)
+            for header in backfill:
+                send_message(client_sock, {"event": "block", "block": header})
+
+            while self.running and not overflow.is_set():
+                try:
+                    header = events.get(timeout=SUBSCRIBER_HEARTBEAT)
+                except queue.Empty:
+                    send_message(client_sock, {"event": "heartbeat", "height": self.blockchain.height})
+                    continue
+                if header['index'] < next_index:
+                    continue
+                next_index = header['index'] + 1
+                send_message(client_sock, {"event": "block", "block": header})
+
+            if overflow.is_set():
+                send_message(client_sock, {"event": "overflow", "height": self.blockchain.height})
         finally:
-            client_sock.close()
+            self.blockchain.unsubscribe(on_block)
+
+    async def _stream_blocks_async(self, reader, writer, write_lock, request):
+        """Pushes block headers to a subscriber until it disconnects (asyncio mode)"""
+        events = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        overflow = asyncio.Event()
+
+        def enqueue(header):
+            if events.full():
+                overflow.set()
+            else:
+                events.put_nowait(header)
+
+        def on_block(block):
+            # Called on whichever thread appended the block
+            self._loop.call_soon_threadsafe(enqueue, block.header_dict())
+
+        self.blockchain.subscribe(on_block)
+        # The client sends nothing after subscribing, so a completed read means it hung up
+        hangup = asyncio.ensure_future(reader.read(1))
+        try:
+            ack, backfill, next_index = self._subscription_start(request)
+            async with write_lock:
+                await write_message(writer, ack)
+                for header in backfill:
+                    await write_message(writer, {"event": "block", "block": header})
+
+            while not overflow.is_set():
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait(
+                    {getter, hangup}, timeout=SUBSCRIBER_HEARTBEAT,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                if hangup in done:
+                    break
+                if not done:
+                    message = {"event": "heartbeat", "height": self.blockchain.height}
+                else:
+                    header = getter.result()
+                    if header['index'] < next_index:
+                        continue
+                    next_index = header['index'] + 1
+                    message = {"event": "block", "block": header}
+                async with write_lock:
+                    await write_message(writer, message)
+
+            if overflow.is_set():
+                async with write_lock:
+                    await write_message(writer, {"event": "overflow", "height": self.blockchain.height})
+        finally:
+            self.blockchain.unsubscribe(on_block)
+            hangup.cancel()
+
+    def _dispatch(self, request, addr=None):
+        """Processes a request and tags the response with its request_id"""
+        try:
+            response = self.process_request(request, addr)
+        except Exception as e:
+            print_error(f"Handler Error: {e}")
+            response = {"status": "error", "message": str(e)}
+        if 'request_id' in request:
+            response['request_id'] = request['request_id']
+        return response
+
+    def _receipt(self, tx_id, tx_hash):
+        """Receipt for an accepted transaction, with its current mining status"""
+        return {"tx_id": tx_id, "tx_hash": tx_hash, **self.blockchain.tx_status(tx_hash)}
+
+    def _ledger_entry(self, tx):
+        """Returns the (account_mask, payload, tx_hash) stored on-chain for a verified transaction"""
+        # We store the FULL TX DATA in the block so we can read it back; canonical, so one tx has one hash
+        tx_json = json.dumps(tx.to_dict(), sort_keys=True, separators=(',', ':'))
+        tx_hash = hashlib.sha256(tx_json.encode()).hexdigest()
+        account_mask = tx.sender_cert['subject'][:3] + "***"
+        return account_mask, tx_json, tx_hash # Storing JSON as "encrypted data" for now
+
+    def process_request(self, request, addr=None):
+        """Runs the action logic for a single request and returns the response dict"""
+        action = request.get('action')
+
+        response = {"status": "error", "message": "Invalid action"}
+
+        if action == 'REGISTER':
+            user_id = request['user_id']
+            pub_key = request['public_key']
+            cert = self.ca.issue_certificate(user_id, pub_key)
+            response = {"status": "success", "certificate": cert}
+
+        elif action == 'GET_CERTIFICATE':
+            user_id = request['user_id']
+            # Scan issued certificates
+            # In a real DB this is fast. Here we scan the dict.
+            target_cert = None
+            for cert in self.ca.issued_certificates.values():
+                if cert.subject == user_id:
+                    target_cert = cert
+                    break
+
+            if target_cert:
+                response = {"status": "success", "certificate": target_cert}
+                print_info(f"Sent Certificate for '{user_id}' to {addr}")
+            else:
+                response = {"status": "error", "message": "User not found"}
+
+        elif action == 'GET_BALANCE':
+            # Balances are kept up to date as blocks are mined; pending transactions are not counted
+            user_id = request.get('user_id')
+            if not user_id:
+                 response = {"status": "error", "message": "Missing user_id"}
+            else:
+                state = self.blockchain.state
+                response = {"status": "success", "balance": state.balance(user_id), "height": state.height}
+
+        elif action == 'SEND_TRANSACTION':
+            tx_data = request['transaction']
+            tx = Transaction.from_dict(tx_data)
+
+            print_processing(f"Processing Transaction: {tx.tx_id} ({tx.type})")
+
+            # Verify
+            if tx.is_valid(self.ca):
+                account_mask, tx_json, tx_hash = self._ledger_entry(tx)
+                if self.blockchain.has_transaction(tx_hash, tx.signed_id()):
+                    return {"status": "error", "message": "Duplicate transaction"}
+
+                if request.get('wait'):
+                    # Synchronous path: reply only once the block is mined
+                    block_index = self.blockchain.add_block(account_mask, tx_json, tx_hash)
+                    if block_index is None:
+                        return {"status": "error", "message": "Mempool full, try again later"}
+                    print_success(f"Mined Block #{block_index} - Tx: {tx_hash[:8]}...")
+                    message = "Transaction Verified & Mined"
+                else:
+                    # Logged to disk before we reply; the background miner picks it up.
+                    # Poll GET_TX_STATUS with the receipt
+                    if not self.blockchain.submit(account_mask, tx_json, tx_hash):
+                        return {"status": "error", "message": "Mempool full, try again later"}
+                    print_success(f"Queued Tx: {tx_hash[:8]}...")
+                    message = "Transaction Verified & Queued"
+
+                response = {"status": "success", "message": message, "receipt": self._receipt(tx.tx_id, tx_hash)}
+            else:
+                print_error(f"Invalid Transaction: {tx.tx_id}")
+                response = {"status": "error", "message": "Invalid Signature or Certificate"}
+
+        elif action == 'SEND_TRANSACTIONS':
+            # Validate the whole batch first, then queue (or with 'wait', mine) the valid ones together
+            results = []
+            candidates = [] # (position in results, transaction) awaiting signature checks
+            seen_ids = set()
+            for tx_data in request['transactions']:
+                try:
+                    tx = Transaction.from_dict(tx_data)
+                except (KeyError, TypeError, ValueError) as e:
+                    results.append({"tx_id": None, "status": "error", "message": f"Malformed transaction: {e}"})
+                    continue
+
+                if not isinstance(tx.tx_id, str):
+                    results.append({"tx_id": None, "status": "error", "message": "Malformed transaction: tx_id must be a string"})
+                    continue
+
+                if tx.tx_id in seen_ids:
+                    results.append({"tx_id": tx.tx_id, "status": "error", "message": "Duplicate tx_id in batch"})
+                else:
+                    candidates.append((len(results), tx))
+                    results.append({"tx_id": tx.tx_id, "status": "success"})
+                seen_ids.add(tx.tx_id)
+
+            entries = []
+            accepted = [] # Positions in results of the transactions in entries
+            verdicts = self.verifier.verify([tx for _, tx in candidates])
+            for (position, tx), valid in zip(candidates, verdicts):
+                if not valid:
+                    results[position].update(status="error", message="Invalid Signature or Certificate")
+                    continue
+                try:
+                    entry = self._ledger_entry(tx)
+                    duplicate = self.blockchain.has_transaction(entry[2], tx.signed_id())
+                except Exception as e:
+                    # e.g. a SYSTEM deposit, which has no certificate to mask an account from
+                    results[position].update(status="error", message=f"Cannot record transaction: {e}")
+                    continue
+                if duplicate:
+                    results[position].update(status="error", message="Duplicate transaction")
+                else:
+                    accepted.append(position)
+                    entries.append(entry)
+
+            try:
+                if request.get('wait'):
+                    outcomes = self.blockchain.add_blocks(entries) if entries else []
+                else:
+                    outcomes = [ok or None for ok in self.blockchain.submit_many(entries)]
+            except Exception as e:
+                print_error(f"Batch submit failed: {e}")
+                outcomes = [e] * len(entries)
+
+            committed = 0
+            for position, entry, outcome in zip(accepted, entries, outcomes):
+                result = results[position]
+                if isinstance(outcome, Exception):
+                    result.update(status="error", message=f"Submit failed: {outcome}")
+                elif outcome is None:
+                    result.update(status="error", message="Mempool full, try again later")
+                else:
+                    committed += 1
+                    result.update(self._receipt(result['tx_id'], entry[2]))
+
+            print_success(f"Batch: {committed} accepted, {len(results) - committed} rejected")
+            response = {
+                "status": "success",
+                "accepted": committed,
+                "rejected": len(results) - committed,
+                "results": results
+            }
+
+        elif action == 'GET_TX_STATUS':
+            tx_id = request.get('tx_id')
+            tx_hash = request.get('tx_hash') or self.blockchain.resolve_tx_id(tx_id)
+            if not tx_hash:
+                response = {"status": "error", "message": "Unknown transaction"}
+            else:
+                response = {"status": "success", **self._receipt(tx_id, tx_hash)}
+
+        elif action == 'GET_TX':
+            found = self.blockchain.find_transaction(tx_hash=request.get('tx_hash'), tx_id=request.get('tx_id'))
+            if not found:
+                response = {"status": "error", "message": "Transaction not on chain"}
+            else:
+                block, (account_mask, payload, tx_hash) = found
+                response = {
+                    "status": "success",
+                    "block": block.header_dict(),
+                    "account_mask": account_mask,
+                    "payload": payload,
+                    "tx_hash": tx_hash
+                }
+
+        elif action == 'GET_ACCOUNT_BLOCKS':
+            # 'account' is a user id or an on-chain account mask; 'since' pages through older results
+            account = request.get('account') or request.get('user_id')
+            if not account:
+                response = {"status": "error", "message": "Missing account"}
+            else:
+                blocks = self.blockchain.get_account_blocks(
+                    account, start=int(request.get('since', 0)), limit=MAX_BLOCKS_PER_REQUEST)
+                response = {"status": "success", "blocks": [b.to_dict() for b in blocks]}
+
+        elif action == 'GET_CHAIN':
+            response = {"status": "success", "chain": [b.to_dict() for b in self.blockchain.chain]}
+
+        elif action == 'GET_BLOCKS':
+            # 'since' is an alias for 'start'; both are inclusive block indexes
+            start = int(request.get('since', request.get('start', 0)))
+            end = request.get('end')
+            end = start + MAX_BLOCKS_PER_REQUEST if end is None else min(int(end), start + MAX_BLOCKS_PER_REQUEST)
+            blocks = self.blockchain.get_blocks(start, end)
+            response = {
+                "status": "success",
+                "height": self.blockchain.height,
+                "blocks": [b.to_dict() for b in blocks]
+            }
+
+        elif action == 'GET_TIP':
+            tip = self.blockchain.last_block
+            response = {"status": "success", "height": tip.index + 1, "hash": tip.hash}
+
+        return response
 
     def stop(self):
         self.running = False
-        self.server_socket.close()
+        self.blockchain.stop_miner()
+        if self._loop is not None and self._stop_event is not None:
+            # The event loop owns the listening socket and closes it on exit
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        else:
+            self.server_socket.close()
 
 if __name__ == "__main__":
-    server = BankingServer()
+    set_reporter(ConsoleReporter())
+    mode = 'asyncio' if '--asyncio' in sys.argv else SERVER_MODE
+    server = BankingServer(mode=mode)
     try:
         server.start()
     except KeyboardInterrupt:
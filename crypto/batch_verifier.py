@@ -0,0 +1,76 @@
+import os
+from infosec_banking.crypto.certificate import Certificate
+from infosec_banking.crypto.signature import SignatureManager
+from infosec_banking.utils.processes import get_pool
+from infosec_banking.config import SIGNATURE_WORKERS, SIGNATURE_BATCH_MIN
+
+def _verify_jobs(jobs):
+    """Runs (public_key_pem, data, signature_b64, algorithm) checks; each worker keeps its own key cache"""
+    return [SignatureManager.verify(public_key, data, signature, algorithm) for public_key, data, signature, algorithm in jobs]
+
+class BatchVerifier:
+    """Checks the signatures of a batch of transactions together.
+
+    Each distinct certificate is verified once per batch (and not at all if
+    the CA has it cached); the remaining signature checks, certificate and
+    transaction alike, are spread across a process pool. Verdicts match
+    Transaction.is_valid().
+    """
+
+    def __init__(self, ca, workers=SIGNATURE_WORKERS, min_batch=SIGNATURE_BATCH_MIN):
+        self.ca = ca
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.min_batch = min_batch
+
+    def _run(self, jobs):
+        if self.workers <= 1 or len(jobs) < self.min_batch:
+            return _verify_jobs(jobs)
+        pool = get_pool(self.workers)
+        size = -(-len(jobs) // (self.workers * 2)) # ceil; two chunks per worker evens out stragglers
+        futures = [pool.submit(_verify_jobs, jobs[i:i + size]) for i in range(0, len(jobs), size)]
+        return [ok for future in futures for ok in future.result()]
+
+    def verify(self, transactions):
+        """Returns one True/False verdict per transaction"""
+        verdicts = [None] * len(transactions)
+        cert_checks = {} # cache key -> (certificate, position in jobs)
+        tx_checks = [] # (transaction position, cache key or None, position in jobs)
+        jobs = []
+
+        for i, tx in enumerate(transactions):
+            if tx.type == 'deposit' and tx.sender_cert == 'SYSTEM':
+                verdicts[i] = True # System deposits are trusted/internal
+                continue
+            if not tx.signature:
+                verdicts[i] = False
+                continue
+            try:
+                cert = tx.sender_cert
+                if isinstance(cert, dict):
+                    cert = Certificate.from_dict(cert)
+            except (KeyError, TypeError):
+                verdicts[i] = False
+                continue
+            if self.ca.is_revoked(cert.serial_number):
+                verdicts[i] = False
+                continue
+
+            cache_key, cert_data = self.ca.verification_key(cert)
+            if self.ca.is_verified(cache_key):
+                cache_key = None
+            elif cache_key not in cert_checks:
+                cert_checks[cache_key] = (cert, len(jobs))
+                jobs.append((self.ca.public_key, cert_data, cert.signature, cert.signature_algorithm))
+
+            tx_checks.append((i, cache_key, len(jobs)))
+            jobs.append((cert.public_key, tx.get_data_to_sign(), tx.signature, cert.key_algorithm))
+
+        results = self._run(jobs) if jobs else []
+
+        for cache_key, (cert, job) in cert_checks.items():
+            if results[job]:
+                self.ca.mark_verified(cert, cache_key)
+        for i, cache_key, job in tx_checks:
+            cert_ok = cache_key is None or results[cert_checks[cache_key][1]]
+            verdicts[i] = bool(cert_ok and results[job])
+        return verdicts
@@ -1,25 +1,35 @@
 import os
 import json
 import uuid
-from infosec_banking.crypto.rsa_manager import RSAManager
+import hashlib
+import datetime
+from infosec_banking.crypto.signature import SignatureManager
 from infosec_banking.crypto.certificate import Certificate
-from infosec_banking.storage.storage_manager import StorageManager
+from infosec_banking.storage.backend import get_backend
 from infosec_banking.utils.colors import print_success, print_info, print_warning
+from infosec_banking.config import CA_KEY_ALGORITHM, VERIFIED_CACHE_SIZE
 
 CA_KEY_FILE = 'data/ca_key.pem'
 CERT_STORE_FILE = 'data/certificates.json'
+CRL_FILE = 'data/crl.json'
 
 import threading
 
 class CertificateAuthority:
     """Certificate Authority (CA) for issuing and verifying certificates"""
 
-    def __init__(self, issuer_name="InfoSec Bank Root CA"):
+    def __init__(self, issuer_name="InfoSec Bank Root CA", algorithm=CA_KEY_ALGORITHM):
         self.issuer_name = issuer_name
+        self.algorithm = algorithm # Replaced by the algorithm of an existing root key
         self.private_key = None
         self.public_key = None
         self.issued_certificates = {}
         self.lock = threading.Lock()
+        self.table = get_backend().open_table('certificates', CERT_STORE_FILE)
+        self.crl_table = get_backend().open_table('revocations', CRL_FILE)
+        self.revoked = set(self.crl_table.load()) # Serial numbers
+        self.verified = {} # (serial, digest of signed data + signature) -> valid_to datetime
+        self.verified_lock = threading.Lock()
         self._load_or_generate_keys()
         self._load_certificates()
 
@@ -29,13 +39,12 @@ class CertificateAuthority:
             with open(CA_KEY_FILE, 'r') as f:
                 self.private_key = f.read()
             # Derive public key from private
-            from Crypto.PublicKey import RSA
-            key = RSA.import_key(self.private_key)
-            self.public_key = key.publickey().export_key().decode('utf-8')
-            print_info("Loaded CA Root Keys")
+            self.public_key = SignatureManager.public_key_of(self.private_key)
+            self.algorithm = SignatureManager.algorithm_of(self.private_key)
+            print_info(f"Loaded CA Root Keys ({self.algorithm})")
         else:
-            print_warning("Generating new CA Root Keys...")
-            self.private_key, self.public_key = RSAManager.generate_key_pair(4096)
+            print_warning(f"Generating new CA Root Keys ({self.algorithm})...")
+            self.private_key, self.public_key = SignatureManager.generate_key_pair(self.algorithm, 4096)
             # Ensure directory exists
             os.makedirs(os.path.dirname(CA_KEY_FILE), exist_ok=True)
             with open(CA_KEY_FILE, 'w') as f:
@@ -44,7 +53,7 @@ class CertificateAuthority:
 
     def _load_certificates(self):
         """Loads issued certificates from storage"""
-        data = StorageManager.load_json(CERT_STORE_FILE, default_data={})
+        data = self.table.load()
         for serial, cert_data in data.items():
             try:
                 self.issued_certificates[serial] = Certificate.from_dict(cert_data)
@@ -52,13 +61,15 @@ class CertificateAuthority:
                 from infosec_banking.utils.colors import print_warning
                 print_warning(f"Skipping corrupted certificate {serial}: {e}")
 
-    def _save_certificates(self):
-        """Saves issued certificates to storage"""
-        data = {serial: cert.to_dict() for serial, cert in self.issued_certificates.items()}
-        StorageManager.atomic_write_json(CERT_STORE_FILE, data)
+    def _save_certificates(self, *serials):
+        """Saves the given certificates (all if none are given) to storage"""
+        if not serials:
+            serials = self.issued_certificates.keys()
+        self.table.put_many({serial: self.issued_certificates[serial].to_dict() for serial in serials})
 
     def issue_certificate(self, user_id, user_public_key):
-        """Issues a new digital certificate for a user"""
+        """Issues a new digital certificate for a user; the key's algorithm is recorded in it"""
+        key_algorithm = SignatureManager.algorithm_of(user_public_key) # Raises ValueError for unusable keys
         with self.lock:
             # Check if user already has a cert (optional, but good for cleanup)
             # For now, we allow multiple certs or just generate a new one
@@ -68,25 +79,82 @@ class CertificateAuthority:
                 serial_number=serial_number,
                 subject=user_id,
                 issuer=self.issuer_name,
-                public_key=user_public_key
+                public_key=user_public_key,
+                key_algorithm=key_algorithm,
+                signature_algorithm=self.algorithm
             )
             
             # Sign the certificate
             data_to_sign = cert.get_data_to_sign()
-            cert.signature = RSAManager.sign(self.private_key, data_to_sign)
+            cert.signature = SignatureManager.sign(self.private_key, data_to_sign)
             
             self.issued_certificates[serial_number] = cert
-            self._save_certificates()
+            self._save_certificates(serial_number)
             print_success(f"Issued Certificate for '{user_id}' (Serial: {serial_number[:8]}...)")
             return cert
 
     def verify_certificate(self, certificate):
-        """Verifies a certificate's signature against the CA's public key"""
+        """Verifies a certificate's signature against the CA's public key.
+
+        Certificates that verified before are remembered until their valid_to
+        or until revoked, so repeat senders skip the signature check. The cache key
+        covers every signed field as well as the signature, so a certificate
+        edited under a known serial is verified afresh (and fails).
+        """
         if isinstance(certificate, dict):
             certificate = Certificate.from_dict(certificate)
-            
+        if certificate.serial_number in self.revoked:
+            return False
+
+        cache_key, data_to_verify = self.verification_key(certificate)
+        if self.is_verified(cache_key):
+            return True
+        if not SignatureManager.verify(self.public_key, data_to_verify, certificate.signature, certificate.signature_algorithm):
+            return False
+        self.mark_verified(certificate, cache_key)
+        return True
+
+    def verification_key(self, certificate):
+        """Returns (cache key, signed data) for a certificate"""
         data_to_verify = certificate.get_data_to_sign()
-        return RSAManager.verify(self.public_key, data_to_verify, certificate.signature)
+        digest = hashlib.sha256(f"{data_to_verify}\n{certificate.signature}".encode('utf-8')).digest()
+        return (certificate.serial_number, digest), data_to_verify
+
+    def is_verified(self, cache_key):
+        """True if the certificate behind cache_key verified before and has not expired"""
+        with self.verified_lock:
+            expires = self.verified.get(cache_key)
+            if expires is None:
+                return False
+            if datetime.datetime.now() < expires:
+                return True
+            del self.verified[cache_key]
+            return False
+
+    def mark_verified(self, certificate, cache_key):
+        """Remembers a certificate whose signature has just been checked"""
+        try:
+            expires = datetime.datetime.fromisoformat(certificate.valid_to)
+        except (TypeError, ValueError):
+            return # Unparseable expiry: verified, but not cached
+        with self.verified_lock:
+            if certificate.serial_number not in self.revoked:
+                if len(self.verified) >= VERIFIED_CACHE_SIZE:
+                    del self.verified[next(iter(self.verified))] # Oldest entry
+                self.verified[cache_key] = expires
+
+    def revoke_certificate(self, serial_number):
+        """Revokes a certificate: records it in the CRL and drops it from the verified cache"""
+        with self.verified_lock:
+            self.revoked.add(serial_number)
+            for cache_key in [k for k in self.verified if k[0] == serial_number]:
+                del self.verified[cache_key]
+        self.crl_table.put(serial_number, {"revoked_at": datetime.datetime.now().isoformat()})
+        print_warning(f"Revoked certificate {serial_number[:8]}...")
+        return True
+
+    def is_revoked(self, serial_number):
+        return serial_number in self.revoked
 
     def get_certificate(self, serial_number):
         return self.issued_certificates.get(serial_number)
@@ -1,10 +1,13 @@
 import json
 import datetime
 
+DEFAULT_ALGORITHM = 'RSA' # Certificates from before algorithms were recorded are RSA throughout
+
 class Certificate:
     """Represents a Digital Certificate (X.509 style)"""
     
-    def __init__(self, serial_number, subject, issuer, public_key, valid_from=None, valid_to=None, signature=None):
+    def __init__(self, serial_number, subject, issuer, public_key, valid_from=None, valid_to=None, signature=None,
+                 key_algorithm=DEFAULT_ALGORITHM, signature_algorithm=DEFAULT_ALGORITHM):
         self.serial_number = serial_number
         self.subject = subject  # User ID
         self.issuer = issuer    # CA Name
@@ -12,6 +15,14 @@ class Certificate:
         self.valid_from = valid_from if valid_from else datetime.datetime.now().isoformat()
         self.valid_to = valid_to if valid_to else (datetime.datetime.now() + datetime.timedelta(days=365)).isoformat()
         self.signature = signature
+        self.key_algorithm = key_algorithm # Algorithm of the subject's key
+        self.signature_algorithm = signature_algorithm # Algorithm the issuer signed with
+
+    def _algorithms(self):
+        """Algorithm fields, left out while both are RSA so older certificates keep their form"""
+        if self.key_algorithm == DEFAULT_ALGORITHM and self.signature_algorithm == DEFAULT_ALGORITHM:
+            return {}
+        return {"key_algorithm": self.key_algorithm, "signature_algorithm": self.signature_algorithm}
 
     def to_dict(self):
         """Converts certificate to dictionary"""
@@ -22,7 +33,8 @@ class Certificate:
             "public_key": self.public_key,
             "valid_from": self.valid_from,
             "valid_to": self.valid_to,
-            "signature": self.signature
+            "signature": self.signature,
+            **self._algorithms()
         }
 
     @staticmethod
@@ -35,7 +47,9 @@ class Certificate:
             public_key=data["public_key"],
             valid_from=data.get("valid_from"),
             valid_to=data.get("valid_to"),
-            signature=data.get("signature")
+            signature=data.get("signature"),
+            key_algorithm=data.get("key_algorithm", DEFAULT_ALGORITHM),
+            signature_algorithm=data.get("signature_algorithm", DEFAULT_ALGORITHM)
         )
 
     def get_data_to_sign(self):
@@ -46,6 +60,7 @@ class Certificate:
             "issuer": self.issuer,
             "public_key": self.public_key,
             "valid_from": self.valid_from,
-            "valid_to": self.valid_to
+            "valid_to": self.valid_to,
+            **self._algorithms()
         }
         return json.dumps(data, sort_keys=True, separators=(',', ':'))
@@ -1,7 +1,6 @@
 import hashlib
 import os
-import time
-from infosec_banking.utils.colors import print_processing, print_success, print_error, print_warning
+from infosec_banking.utils.colors import print_processing, print_success, print_error, print_warning, pause
 from infosec_banking.config import AES_KEY_SIZE, AES_IV_SIZE
 
 USE_AES = False
@@ -62,7 +61,7 @@ class CryptoManager:
     @staticmethod
     def derive_key(password: str) -> bytes:
         print_processing("Deriving encryption key...")
-        time.sleep(0.1)
+        pause(0.1)
         key_hash = hashlib.sha256(password.encode()).digest()
         print_success("Key derived")
         return key_hash
@@ -70,7 +69,7 @@ class CryptoManager:
     @staticmethod
     def encrypt(plaintext: str, key_bytes: bytes) -> bytes:
         print_processing("Encrypting transaction...")
-        time.sleep(0.1)
+        pause(0.1)
         if USE_AES:
             try:
                 iv = os.urandom(AES_IV_SIZE)
@@ -90,7 +89,7 @@ class CryptoManager:
     @staticmethod
     def decrypt(iv_plus_ct: bytes, key_bytes: bytes) -> str:
         print_processing("Decrypting transaction...")
-        time.sleep(0.1)
+        pause(0.1)
         if USE_AES:
             if len(iv_plus_ct) < AES_IV_SIZE:
                 raise ValueError("Ciphertext too short for IV")
@@ -0,0 +1,48 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from infosec_banking.config import KEY_CACHE_SIZE
+
+class KeyCache:
+    """Bounded LRU of objects built from key material, keyed by the material's SHA-256.
+
+    Keying by digest means the cache never holds a second copy of the PEM
+    text. Hit and miss counters show whether the cache is sized right.
+    """
+
+    def __init__(self, max_size=KEY_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, material, build):
+        """Returns the cached object for material, calling build(material) on a miss"""
+        data = material.encode('utf-8') if isinstance(material, str) else material
+        digest = hashlib.sha256(data).digest()
+        with self._lock:
+            value = self._entries.get(digest)
+            if value is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Build outside the lock; a racing miss just builds the same object twice
+        value = build(material)
+        with self._lock:
+            self._entries[digest] = value
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns hit/miss counters and the current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
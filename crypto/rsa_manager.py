@@ -3,11 +3,33 @@ from Crypto.PublicKey import RSA
 from Crypto.Signature import pkcs1_15
 from Crypto.Cipher import PKCS1_OAEP
 from Crypto.Hash import SHA256
+from infosec_banking.crypto.key_cache import KeyCache
 from infosec_banking.utils.colors import print_error, print_success
 
+class _ParsedKey:
+    """An imported RSA key with its signature scheme and OAEP cipher, ready for reuse"""
+    __slots__ = ('key', 'signer', 'cipher')
+
+    def __init__(self, pem):
+        self.key = RSA.import_key(pem)
+        self.signer = pkcs1_15.new(self.key)
+        self.cipher = PKCS1_OAEP.new(self.key)
+
 class RSAManager:
     """Manages RSA Key Generation, Signing, Verification, and Encryption"""
 
+    # Parsing a PEM (especially the 4096-bit CA key) costs far more than a verify
+    key_cache = KeyCache()
+
+    @staticmethod
+    def _parsed(key_pem):
+        return RSAManager.key_cache.get(key_pem, _ParsedKey)
+
+    @staticmethod
+    def cache_stats():
+        """Returns hit/miss counters of the parsed-key cache"""
+        return RSAManager.key_cache.stats()
+
     @staticmethod
     def generate_key_pair(bits=2048):
         """Generates an RSA key pair"""
@@ -23,9 +45,8 @@ class RSAManager:
             if isinstance(data, str):
                 data = data.encode('utf-8')
             
-            key = RSA.import_key(private_key_pem)
             h = SHA256.new(data)
-            signature = pkcs1_15.new(key).sign(h)
+            signature = RSAManager._parsed(private_key_pem).signer.sign(h)
             return base64.b64encode(signature).decode('utf-8')
         except Exception as e:
             print_error(f"Signing failed: {e}")
@@ -38,11 +59,10 @@ class RSAManager:
             if isinstance(data, str):
                 data = data.encode('utf-8')
                 
-            key = RSA.import_key(public_key_pem)
             h = SHA256.new(data)
             signature = base64.b64decode(signature_b64)
             
-            pkcs1_15.new(key).verify(h, signature)
+            RSAManager._parsed(public_key_pem).signer.verify(h, signature)
             return True
         except (ValueError, TypeError):
             return False
@@ -57,9 +77,7 @@ class RSAManager:
             if isinstance(data, str):
                 data = data.encode('utf-8')
             
-            key = RSA.import_key(public_key_pem)
-            cipher = PKCS1_OAEP.new(key)
-            ciphertext = cipher.encrypt(data)
+            ciphertext = RSAManager._parsed(public_key_pem).cipher.encrypt(data)
             return base64.b64encode(ciphertext).decode('utf-8')
         except Exception as e:
             print_error(f"RSA Encryption failed: {e}")
@@ -70,9 +88,7 @@ class RSAManager:
         """Decrypts data with a private key (RSA-OAEP)"""
         try:
             ciphertext = base64.b64decode(ciphertext_b64)
-            key = RSA.import_key(private_key_pem)
-            cipher = PKCS1_OAEP.new(key)
-            plaintext = cipher.decrypt(ciphertext)
+            plaintext = RSAManager._parsed(private_key_pem).cipher.decrypt(ciphertext)
             return plaintext.decode('utf-8')
         except Exception as e:
             print_error(f"RSA Decryption failed: {e}")
@@ -0,0 +1,62 @@
+import threading
+import time
+from infosec_banking.config import SESSION_KEY_TTL, SESSION_KEY_IDLE
+
+class SessionKeyCache:
+    """Keys derived at login, held per user until logout, the TTL or the idle timeout.
+
+    Keys are stored in bytearrays so that wiping overwrites them in place.
+    Callers get a copy, which a wipe on another thread cannot zero out
+    halfway through an encryption.
+    """
+
+    def __init__(self, ttl=SESSION_KEY_TTL, idle=SESSION_KEY_IDLE, clock=time.monotonic):
+        self.ttl = ttl
+        self.idle = idle
+        self.clock = clock
+        self._entries = {} # user_id -> [key bytearray, created, last used]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _zero(key):
+        key[:] = bytes(len(key))
+
+    def _expired(self, entry, now):
+        _, created, last_used = entry
+        return now - created >= self.ttl or now - last_used >= self.idle
+
+    def put(self, user_id, key):
+        now = self.clock()
+        with self._lock:
+            self._evict(now)
+            old = self._entries.pop(user_id, None)
+            if old is not None:
+                self._zero(old[0])
+            self._entries[user_id] = [bytearray(key), now, now]
+
+    def get(self, user_id):
+        """Returns the user's session key, or None if there is none or it has expired"""
+        now = self.clock()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            entry[2] = now
+            return bytes(entry[0])
+
+    def _evict(self, now):
+        for user_id in [u for u, entry in self._entries.items() if self._expired(entry, now)]:
+            self._zero(self._entries.pop(user_id)[0])
+
+    def wipe(self, user_id):
+        with self._lock:
+            entry = self._entries.pop(user_id, None)
+            if entry is not None:
+                self._zero(entry[0])
+
+    def wipe_all(self):
+        with self._lock:
+            for entry in self._entries.values():
+                self._zero(entry[0])
+            self._entries.clear()
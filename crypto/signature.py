@@ -0,0 +1,157 @@
+import base64
+from Crypto.PublicKey import ECC, RSA
+from Crypto.Signature import DSS, eddsa
+from Crypto.Cipher import AES
+from Crypto.Hash import SHA256
+from Crypto.Protocol.DH import key_agreement
+from Crypto.Protocol.KDF import HKDF
+from infosec_banking.crypto.key_cache import KeyCache
+from infosec_banking.crypto.rsa_manager import RSAManager
+from infosec_banking.utils.colors import print_error
+
+RSA_SHA256 = 'RSA' # PKCS#1 v1.5 over SHA-256, the original scheme
+ED25519 = 'Ed25519'
+ECDSA_P256 = 'ECDSA-P256' # Deterministic ECDSA (RFC 6979) over SHA-256
+
+ALGORITHMS = (RSA_SHA256, ED25519, ECDSA_P256)
+_CURVES = {ED25519: 'Ed25519', ECDSA_P256: 'P-256'}
+_ALGORITHM_OF_CURVE = {'Ed25519': ED25519, 'NIST P-256': ECDSA_P256}
+
+ECDH_PREFIX = 'ecdh-p256:' # Marks a memo key wrapped by ECDH rather than RSA-OAEP
+
+class _ParsedKey:
+    """An imported key with its algorithm and, for EC keys, a reusable signer.
+
+    RSA keys only record their algorithm here; RSAManager parses and caches
+    them itself.
+    """
+    __slots__ = ('key', 'algorithm', 'signer')
+
+    def __init__(self, pem):
+        try:
+            self.key = ECC.import_key(pem)
+        except ValueError:
+            RSA.import_key(pem) # Raises on anything that is not an RSA key either
+            self.key, self.algorithm, self.signer = None, RSA_SHA256, None
+            return
+        self.algorithm = _ALGORITHM_OF_CURVE.get(self.key.curve)
+        if self.algorithm == ED25519:
+            self.signer = eddsa.new(self.key, 'rfc8032')
+        elif self.algorithm == ECDSA_P256:
+            self.signer = DSS.new(self.key, 'deterministic-rfc6979' if self.key.has_private() else 'fips-186-3')
+        else:
+            raise ValueError(f"Unsupported curve {self.key.curve}")
+
+    def message(self, data):
+        """Ed25519 signs the message itself; ECDSA signs its SHA-256"""
+        return data if self.algorithm == ED25519 else SHA256.new(data)
+
+class SignatureManager:
+    """Signs and verifies with RSA, Ed25519 or ECDSA P-256 keys.
+
+    The algorithm of a key follows from its PEM, so signing needs only the
+    private key. Verification takes the algorithm a certificate records and
+    rejects keys of any other type.
+    """
+
+    key_cache = KeyCache()
+
+    @staticmethod
+    def _parsed(key_pem):
+        return SignatureManager.key_cache.get(key_pem, _ParsedKey)
+
+    @staticmethod
+    def algorithm_of(key_pem):
+        """Returns the signature algorithm of a PEM key"""
+        return SignatureManager._parsed(key_pem).algorithm
+
+    @staticmethod
+    def generate_key_pair(algorithm=RSA_SHA256, bits=2048):
+        """Generates a key pair; bits only applies to RSA"""
+        if algorithm == RSA_SHA256:
+            return RSAManager.generate_key_pair(bits)
+        if algorithm not in _CURVES:
+            raise ValueError(f"Unknown signature algorithm '{algorithm}'")
+        key = ECC.generate(curve=_CURVES[algorithm])
+        return key.export_key(format='PEM'), key.public_key().export_key(format='PEM')
+
+    @staticmethod
+    def public_key_of(private_key_pem):
+        """Derives the public key PEM from a private key PEM"""
+        parsed = SignatureManager._parsed(private_key_pem)
+        if parsed.algorithm == RSA_SHA256:
+            return RSA.import_key(private_key_pem).publickey().export_key().decode('utf-8')
+        return parsed.key.public_key().export_key(format='PEM')
+
+    @staticmethod
+    def sign(private_key_pem, data):
+        """Signs data with a private key of any supported algorithm"""
+        try:
+            parsed = SignatureManager._parsed(private_key_pem)
+            if parsed.algorithm == RSA_SHA256:
+                return RSAManager.sign(private_key_pem, data)
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            signature = parsed.signer.sign(parsed.message(data))
+            return base64.b64encode(signature).decode('utf-8')
+        except Exception as e:
+            print_error(f"Signing failed: {e}")
+            return None
+
+    @staticmethod
+    def verify(public_key_pem, data, signature_b64, algorithm=RSA_SHA256):
+        """Verifies a signature; the key must be of the given algorithm"""
+        try:
+            parsed = SignatureManager._parsed(public_key_pem)
+            if parsed.algorithm != algorithm:
+                return False
+            if algorithm == RSA_SHA256:
+                return RSAManager.verify(public_key_pem, data, signature_b64)
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            parsed.signer.verify(parsed.message(data), base64.b64decode(signature_b64))
+            return True
+        except (ValueError, TypeError):
+            return False
+        except Exception as e:
+            print_error(f"Verification error: {e}")
+            return False
+
+    @staticmethod
+    def wrap_key(public_key_pem, key):
+        """Encrypts a symmetric key for the holder of public_key_pem.
+
+        RSA keys use RSA-OAEP as before. P-256 keys use ECDH with a fresh
+        ephemeral key, HKDF-SHA256 and AES-GCM. Ed25519 keys can only sign.
+        """
+        parsed = SignatureManager._parsed(public_key_pem)
+        if parsed.algorithm == RSA_SHA256:
+            return RSAManager.encrypt(public_key_pem, key)
+        if parsed.algorithm != ECDSA_P256:
+            raise ValueError(f"{parsed.algorithm} keys cannot receive encrypted memos")
+
+        ephemeral = ECC.generate(curve='P-256')
+        ephemeral_der = ephemeral.public_key().export_key(format='DER')
+        kek = key_agreement(static_priv=ephemeral, static_pub=parsed.key,
+                            kdf=lambda z: HKDF(z, 32, ephemeral_der, SHA256))
+        cipher = AES.new(kek, AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(key)
+        return ECDH_PREFIX + ':'.join(base64.b64encode(part).decode('utf-8')
+                                      for part in (ephemeral_der, cipher.nonce, tag, ciphertext))
+
+    @staticmethod
+    def unwrap_key(private_key_pem, wrapped):
+        """Recovers a symmetric key wrapped by wrap_key(); returns None on failure"""
+        try:
+            parsed = SignatureManager._parsed(private_key_pem)
+            if not wrapped.startswith(ECDH_PREFIX):
+                return RSAManager._parsed(private_key_pem).cipher.decrypt(base64.b64decode(wrapped))
+
+            ephemeral_der, nonce, tag, ciphertext = (base64.b64decode(part) for part in
+                                                     wrapped[len(ECDH_PREFIX):].split(':'))
+            kek = key_agreement(static_priv=parsed.key, static_pub=ECC.import_key(ephemeral_der),
+                                kdf=lambda z: HKDF(z, 32, ephemeral_der, SHA256))
+            return AES.new(kek, AES.MODE_GCM, nonce=nonce).decrypt_and_verify(ciphertext, tag)
+        except Exception as e:
+            print_error(f"Key unwrap failed: {e}")
+            return None
@@ -3,7 +3,7 @@ import os
 import sys
 import pickle
 import socket
-from infosec_banking.utils.colors import Colors, print_header
+from infosec_banking.utils.colors import Colors, print_header, set_reporter, ConsoleReporter
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,40 +13,47 @@ from infosec_banking.core.client import BankingClient
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def render_chain(chain):
+    clear_screen()
+    print_header("REAL-TIME BLOCKCHAIN MONITOR")
+    print(f"{Colors.BOLD}Network Status: {Colors.GREEN}ONLINE{Colors.ENDC}")
+    print(f"Total Blocks:   {len(chain)}")
+    print("-" * 80)
+    print(f"{'Block #':<8} | {'Hash':<20} | {'Tx Hash':<20} | {'Miner'}")
+    print("-" * 80)
+    
+    for block in chain:
+        b_hash = block['hash'][:18] + "..." if len(block['hash']) > 18 else block['hash']
+        tx_hash = block['tx_hash'][:18] + "..." if len(block['tx_hash']) > 18 else block['tx_hash']
+        miner = block['account_mask']
+        
+        print(f"{block['index']:<8} | {Colors.CYAN}{b_hash:<20}{Colors.ENDC} | {Colors.YELLOW}{tx_hash:<20}{Colors.ENDC} | {miner}")
+    
+    print("-" * 80)
+    print(f"\n{Colors.BLINK}Waiting for new blocks...{Colors.ENDC}")
+
 def run_dashboard():
     client = BankingClient(port=5005)
+    chain = [] # Local copy; blocks mined later are pushed by the server
     
     while True:
         try:
-            resp = client.send_request({"action": "GET_CHAIN"})
-            if resp['status'] == 'success':
-                chain = resp['chain']
-                clear_screen()
-                print_header("REAL-TIME BLOCKCHAIN MONITOR")
-                print(f"{Colors.BOLD}Network Status: {Colors.GREEN}ONLINE{Colors.ENDC}")
-                print(f"Total Blocks:   {len(chain)}")
-                print("-" * 80)
-                print(f"{'Block #':<8} | {'Hash':<20} | {'Tx Hash':<20} | {'Miner'}")
-                print("-" * 80)
-                
-                for block in chain:
-                    b_hash = block['hash'][:18] + "..." if len(block['hash']) > 18 else block['hash']
-                    tx_hash = block['tx_hash'][:18] + "..." if len(block['tx_hash']) > 18 else block['tx_hash']
-                    miner = block['account_mask']
-                    
-                    print(f"{block['index']:<8} | {Colors.CYAN}{b_hash:<20}{Colors.ENDC} | {Colors.YELLOW}{tx_hash:<20}{Colors.ENDC} | {miner}")
-                
-                print("-" * 80)
-                print(f"\n{Colors.BLINK}Waiting for new blocks...{Colors.ENDC}")
-            else:
-                print(f"Error: {resp.get('message')}")
+            ok, message = client.sync_chain(chain)
+            if not ok:
+                raise ConnectionError(message)
+            render_chain(chain)
+
+            # Blocks only while idle; returns if the server drops us, then we resync
+            for header in client.subscribe_blocks(since=len(chain)):
+                chain.append(header)
+                render_chain(chain)
         except Exception as e:
             clear_screen()
             print_header("REAL-TIME BLOCKCHAIN MONITOR")
             print(f"{Colors.BOLD}Network Status: {Colors.RED}OFFLINE{Colors.ENDC}")
             print(f"Error: {e}")
-        
-        time.sleep(2)
+            time.sleep(2)
 
 if __name__ == "__main__":
+    set_reporter(ConsoleReporter())
     run_dashboard()
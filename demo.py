@@ -11,7 +11,7 @@ from infosec_banking.core.server import BankingServer
 from infosec_banking.core.client import BankingClient
 from infosec_banking.models.wallet import Wallet
 from infosec_banking.models.transaction import Transaction
-from infosec_banking.utils.colors import Colors, print_header, print_success, print_error, print_info, print_warning, print_processing
+from infosec_banking.utils.colors import Colors, print_header, print_success, print_error, print_info, print_warning, print_processing, set_reporter, ConsoleReporter
 
 def run_server():
     server = BankingServer(port=5005)
@@ -121,4 +121,5 @@ def demo_run():
     print_header("DEMO COMPLETE")
 
 if __name__ == "__main__":
+    set_reporter(ConsoleReporter())
     demo_run()
@@ -10,12 +10,14 @@ from infosec_banking.core.client import BankingClient
 from infosec_banking.models.wallet import Wallet
 from infosec_banking.models.transaction import Transaction
 from infosec_banking.crypto.certificate import Certificate
-from infosec_banking.utils.colors import Colors, print_header, print_info, print_error, print_success, print_warning, print_processing
+from infosec_banking.crypto.signature import ED25519
+from infosec_banking.utils.colors import Colors, print_header, print_info, print_error, print_success, print_warning, print_processing, set_reporter, ConsoleReporter
 from infosec_banking.demo import demo_run
 
 def main():
     client = BankingClient(port=5005)
     current_wallet = None
+    chain = [] # Local ledger copy, synced incrementally
 
     while True:
         print_header("RSA/PKI BANKING CLIENT")
@@ -23,8 +25,8 @@ def main():
         # Check Server Status
         server_status = f"{Colors.RED}Offline{Colors.ENDC}"
         try:
-            # Simple ping (get chain length or just connect)
-            resp = client.send_request({"action": "GET_CHAIN"})
+            # Simple ping (tip only, not the whole chain)
+            resp = client.send_request({"action": "GET_TIP"})
             if resp.get('status') == 'success':
                 server_status = f"{Colors.GREEN}Online (Port {client.port}){Colors.ENDC}"
         except:
@@ -59,7 +61,7 @@ def main():
             if user_id:
                 print_processing(f"Loading/Generating Keys for {user_id}...")
                 current_wallet = Wallet(user_id)
-                print_success(f"Wallet loaded for {user_id}")
+                print_success(f"Wallet loaded for {user_id} ({current_wallet.algorithm} keys)")
         
         elif choice == '2':
             if not current_wallet:
@@ -84,10 +86,11 @@ def main():
                 print_error("Please load a wallet first.")
                 continue
             
-            # In this demo, balance is just a placeholder or requires scanning
-            # We'll just ping the server
-            resp = client.send_request({"action": "GET_BALANCE"})
-            print_info(f"Server Response: {resp}")
+            resp = client.send_request({"action": "GET_BALANCE", "user_id": current_wallet.user_id})
+            if resp['status'] == 'success':
+                print_info(f"Balance: ${resp['balance']:.2f} (as of block #{resp['height'] - 1})")
+            else:
+                print_error(f"Balance unavailable: {resp.get('message')}")
 
         elif choice == '4':
             if not current_wallet or not current_wallet.certificate:
@@ -105,6 +108,9 @@ def main():
             
             recipient_cert = Certificate.from_dict(resp['certificate'])
             print_success(f"Got Certificate for {recipient} (Serial: {recipient_cert.serial_number[:8]}...)")
+            if recipient_cert.key_algorithm == ED25519:
+                print_error(f"{recipient} holds an Ed25519 signing key, which cannot receive encrypted memos")
+                continue
 
             try:
                 amount = float(input("Amount: "))
@@ -156,14 +162,13 @@ def main():
                 print_error("Invalid amount")
 
         elif choice == '5':
-            resp = client.send_request({"action": "GET_CHAIN"})
-            if resp['status'] == 'success':
-                chain = resp['chain']
+            ok, message = client.sync_chain(chain)
+            if ok:
                 print(f"\n{Colors.BOLD}Blockchain Ledger ({len(chain)} blocks){Colors.ENDC}")
                 for block in chain:
                     print(f"Block #{block['index']} | Hash: {block['hash'][:10]}... | Tx: {block['tx_hash'][:10]}...")
             else:
-                print_error(f"Error: {resp.get('message')}")
+                print_error(f"Error: {message}")
             input("\nPress Enter to continue...")
 
         elif choice == '9':
@@ -179,4 +184,5 @@ def main():
         time.sleep(0.5)
 
 if __name__ == "__main__":
+    set_reporter(ConsoleReporter())
     main()
@@ -0,0 +1,94 @@
+from infosec_banking.models.block import read_payload, payload_parties
+from infosec_banking.storage.storage_manager import StorageManager
+from infosec_banking.utils.colors import print_info, print_warning
+from infosec_banking.config import ACCOUNT_STATE_FILE, ACCOUNT_SNAPSHOT_EVERY, DEFAULT_BALANCE
+
+SYSTEM_ACCOUNT = 'SYSTEM'
+
+class AccountState:
+    """Per-account balances materialized from the plaintext transactions on-chain.
+
+    Every account opens with DEFAULT_BALANCE. Each committed transaction debits
+    its sender and credits its receiver (deposits have no sender to debit and
+    withdrawals no receiver to credit). Encrypted payloads cannot be read here
+    and are skipped; BankingSystem keeps those balances in UserManager.
+    """
+
+    def __init__(self, snapshot_path=ACCOUNT_STATE_FILE, snapshot_every=ACCOUNT_SNAPSHOT_EVERY,
+                 opening_balance=DEFAULT_BALANCE):
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.opening_balance = opening_balance
+        self.balances = {}
+        self.height = 0 # Number of blocks applied
+        self.tip_hash = None
+        self.snapshot_height = 0
+
+    def balance(self, account):
+        """Returns the current balance of an account"""
+        return self.balances.get(account, self.opening_balance)
+
+    def _credit(self, account, amount):
+        if account is None or account == SYSTEM_ACCOUNT:
+            return
+        self.balances[account] = self.balance(account) + amount
+
+    def apply_transaction(self, tx):
+        """Applies one parsed transaction payload"""
+        sender, receiver = payload_parties(tx)
+        amount = float(tx.get('amount', 0.0))
+        tx_type = tx.get('type')
+        if tx_type != 'deposit':
+            self._credit(sender, -amount)
+        if tx_type != 'withdraw':
+            self._credit(receiver, amount)
+
+    def apply_block(self, block):
+        """Applies the next block; blocks must arrive in height order"""
+        if block.index != self.height:
+            raise ValueError(f"Account state at height {self.height} cannot apply block #{block.index}")
+        for _, payload, _ in block.entries():
+            tx = read_payload(payload)
+            if tx:
+                self.apply_transaction(tx)
+        self.height = block.index + 1
+        self.tip_hash = block.hash
+
+    def reset(self):
+        self.balances = {}
+        self.height = 0
+        self.tip_hash = None
+
+    def needs_snapshot(self):
+        return self.height - self.snapshot_height >= self.snapshot_every
+
+    def save(self):
+        """Writes a snapshot tagged with the height and tip hash it reflects"""
+        StorageManager.atomic_write_json(self.snapshot_path, {
+            'height': self.height,
+            'tip_hash': self.tip_hash,
+            'balances': self.balances
+        })
+        self.snapshot_height = self.height
+
+    def load(self, chain):
+        """Restores the last snapshot that still matches chain, then replays the blocks after it"""
+        self.reset()
+        snapshot = StorageManager.load_json(self.snapshot_path, default_data={})
+        height = snapshot.get('height', 0)
+        if 0 < height <= len(chain) and chain[height - 1].hash == snapshot.get('tip_hash'):
+            self.balances = {account: float(balance) for account, balance in snapshot.get('balances', {}).items()}
+            self.height = height
+            self.tip_hash = snapshot['tip_hash']
+        elif height:
+            print_warning("Account snapshot does not match the ledger; rebuilding balances")
+        self.snapshot_height = self.height
+
+        for block in chain[self.height:]:
+            if block.index != self.height:
+                # A block went missing from the ledger; is_valid() reports it, balances stop here
+                print_warning(f"Account state stops at height {self.height}: next block is #{block.index}")
+                break
+            self.apply_block(block)
+        if self.height > self.snapshot_height:
+            print_info(f"Replayed {self.height - self.snapshot_height} block(s) into account state")
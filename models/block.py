@@ -1,29 +1,245 @@
 import hashlib
+import sys
 import time
 import json
 import datetime
 from infosec_banking.utils.colors import print_processing, print_success
+from infosec_banking.config import MINING_WORKERS
+
+MULTI_TX_MASK = "*MULTI*"
 
 def _canonical_json(data: dict) -> str:
     """Returns canonical JSON for consistent hashing"""
     return json.dumps(data, sort_keys=True, separators=(',', ':'))
 
+def hash_midstate(fields):
+    """Pre-hashes the canonical header JSON up to the nonce.
+
+    Returns (sha256 state fed with everything before the nonce digits,
+    encoded remainder after them). hash_with_nonce() on these gives the
+    same digest as hashing _canonical_json(fields) with that nonce.
+    """
+    text = _canonical_json(dict(fields, nonce=None))
+    # String values are escaped, so this marker can only be the real key
+    prefix, _, suffix = text.partition('"nonce":null')
+    return hashlib.sha256((prefix + '"nonce":').encode('utf-8')), suffix.encode('utf-8')
+
+def hash_with_nonce(state, suffix, nonce):
+    """Finishes a midstate from hash_midstate() for one nonce"""
+    h = state.copy()
+    h.update(b'%d' % nonce + suffix)
+    return h.hexdigest()
+
+def merkle_leaf(account_mask, encrypted_tx_hex, tx_hash):
+    """Hashes a whole block entry, so the root commits to its mask and payload too"""
+    entry = {'account_mask': account_mask, 'encrypted_tx_hex': encrypted_tx_hex, 'tx_hash': tx_hash}
+    return hashlib.sha256(_canonical_json(entry).encode('utf-8')).digest()
+
+def compute_merkle_root(entries):
+    """Returns the hex SHA-256 Merkle root of (account_mask, encrypted_tx_hex, tx_hash) entries.
+
+    Odd levels duplicate their last node; a single leaf is its own root.
+    """
+    if not entries:
+        return hashlib.sha256(b'').hexdigest()
+    level = [merkle_leaf(*entry) for entry in entries]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+def read_payload(payload):
+    """Parses a plaintext (JSON) transaction payload; returns None for encrypted ones"""
+    if not payload.startswith('{'):
+        return None
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+def payload_parties(tx):
+    """Returns (sender, receiver) ids of a parsed transaction payload"""
+    sender = tx.get('sender_cert')
+    if isinstance(sender, dict):
+        sender = sender.get('subject')
+    return sender, tx.get('receiver_id')
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+def _pack_hex(value):
+    """Keeps a lowercase hex string as raw bytes (half the size); anything else is kept as-is"""
+    if isinstance(value, str) and len(value) % 2 == 0:
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            return value
+        if raw.hex() == value:
+            return raw
+    return value
+
+def _unpack_hex(value):
+    return value.hex() if isinstance(value, bytes) else value
+
+def _pack_timestamp(value):
+    """Keeps an ISO timestamp as integer microseconds when it converts back exactly"""
+    if isinstance(value, int):
+        return (value,) # A literal integer, distinct from a packed one
+    if isinstance(value, str):
+        try:
+            micros = (datetime.datetime.fromisoformat(value) - _EPOCH) // _MICROSECOND
+        except (ValueError, TypeError):
+            return value
+        if _unpack_timestamp(micros) == value:
+            return micros
+    return value
+
+def _unpack_timestamp(value):
+    if isinstance(value, int):
+        return (_EPOCH + datetime.timedelta(microseconds=value)).isoformat()
+    if isinstance(value, tuple):
+        return value[0]
+    return value
+
 class Block:
-    """Represents a block in the blockchain"""
-    
-    def __init__(self, index, account_mask, encrypted_tx_hex, tx_hash, previous_hash, nonce=0, timestamp=None):
+    """Represents a block in the blockchain.
+
+    A single-transaction block keeps the transaction in its header fields.
+    A multi-transaction block lists them in `transactions` and its header
+    `tx_hash` is their Merkle root, so the block hash commits to all of them.
+
+    Hex fields are held as raw bytes and timestamps as integer microseconds;
+    the properties convert back to the exact strings that are hashed and saved.
+    The stored hash is trusted until check() recomputes it.
+    """
+
+    __slots__ = ('index', 'account_mask', 'nonce', '_timestamp', '_payload',
+                 '_tx_hash', '_previous_hash', '_transactions', '_hash')
+
+    def __init__(self, index, account_mask, encrypted_tx_hex, tx_hash, previous_hash, nonce=0, timestamp=None, transactions=None):
         self.index = index
         self.timestamp = timestamp if timestamp else datetime.datetime.now().isoformat()
-        self.account_mask = account_mask
+        self.account_mask = sys.intern(account_mask) # Masks repeat across many blocks
         self.encrypted_tx_hex = encrypted_tx_hex
         self.tx_hash = tx_hash
         self.previous_hash = previous_hash
         self.nonce = nonce
-        self.hash = self.compute_hash()
+        self.transactions = transactions
+        self._hash = None # Computed on first use
 
-    def compute_hash(self):
-        """Computes block hash"""
-        data_to_hash = {
+    @property
+    def timestamp(self):
+        return _unpack_timestamp(self._timestamp)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = _pack_timestamp(value)
+
+    @property
+    def encrypted_tx_hex(self):
+        return _unpack_hex(self._payload)
+
+    @encrypted_tx_hex.setter
+    def encrypted_tx_hex(self, value):
+        self._payload = _pack_hex(value)
+
+    @property
+    def tx_hash(self):
+        return _unpack_hex(self._tx_hash)
+
+    @tx_hash.setter
+    def tx_hash(self, value):
+        self._tx_hash = _pack_hex(value)
+
+    @property
+    def previous_hash(self):
+        return _unpack_hex(self._previous_hash)
+
+    @previous_hash.setter
+    def previous_hash(self, value):
+        self._previous_hash = _pack_hex(value)
+
+    @property
+    def hash(self):
+        if self._hash is None:
+            self._hash = _pack_hex(self.compute_hash())
+        return _unpack_hex(self._hash)
+
+    @hash.setter
+    def hash(self, value):
+        self._hash = _pack_hex(value)
+
+    @property
+    def transactions(self):
+        """The listed transactions as dicts, or None for a single-transaction block"""
+        if self._transactions is None:
+            return None
+        return [
+            {'account_mask': m, 'encrypted_tx_hex': _unpack_hex(p), 'tx_hash': _unpack_hex(h)}
+            for m, p, h in self._transactions
+        ]
+
+    @transactions.setter
+    def transactions(self, value):
+        if value is None:
+            self._transactions = None
+        else:
+            self._transactions = tuple(
+                (t['account_mask'], _pack_hex(t['encrypted_tx_hex']), _pack_hex(t['tx_hash'])) for t in value
+            )
+
+    @staticmethod
+    def from_entries(index, entries, previous_hash):
+        """Builds an unmined block from (account_mask, encrypted_tx_hex, tx_hash) entries"""
+        if len(entries) == 1:
+            account_mask, encrypted_tx_hex, tx_hash = entries[0]
+            return Block(index, account_mask, encrypted_tx_hex, tx_hash, previous_hash)
+
+        masks = {entry[0] for entry in entries}
+        transactions = [
+            {'account_mask': m, 'encrypted_tx_hex': p, 'tx_hash': h} for m, p, h in entries
+        ]
+        return Block(
+            index=index,
+            account_mask=masks.pop() if len(masks) == 1 else MULTI_TX_MASK,
+            encrypted_tx_hex="",
+            tx_hash=compute_merkle_root(entries),
+            previous_hash=previous_hash,
+            transactions=transactions
+        )
+
+    @property
+    def tx_count(self):
+        return len(self._transactions) if self._transactions is not None else 1
+
+    def entries(self):
+        """Returns the block's transactions as (account_mask, encrypted_tx_hex, tx_hash) tuples"""
+        if self._transactions is None:
+            return [(self.account_mask, self.encrypted_tx_hex, self.tx_hash)]
+        return [(m, _unpack_hex(p), _unpack_hex(h)) for m, p, h in self._transactions]
+
+    def has_valid_merkle_root(self):
+        """Checks that the header commits to the listed transactions, payloads and masks included"""
+        if self._transactions is None:
+            return True
+        return self.tx_hash == compute_merkle_root(self.entries())
+
+    def check(self, previous_hash, difficulty):
+        """Returns the reason this block fails verification, or None if it is valid"""
+        if self.hash != self.compute_hash():
+            return "hash mismatch"
+        if not self.has_valid_merkle_root():
+            return "Merkle root mismatch"
+        if self.previous_hash != previous_hash:
+            return "chain link broken"
+        if self.hash[:difficulty] != '0' * difficulty:
+            return "failed PoW check"
+        return None
+
+    def hash_fields(self):
+        """Returns the fields covered by the block hash"""
+        return {
             'index': self.index,
             'timestamp': self.timestamp,
             'account_mask': self.account_mask,
@@ -32,31 +248,70 @@ class Block:
             'previous_hash': self.previous_hash,
             'nonce': self.nonce,
         }
-        block_string = _canonical_json(data_to_hash).encode('utf-8')
+
+    def compute_hash(self):
+        """Computes block hash"""
+        block_string = _canonical_json(self.hash_fields()).encode('utf-8')
         return hashlib.sha256(block_string).hexdigest()
 
-    def mine_block(self, difficulty):
-        """Mines block using Proof-of-Work"""
+    def mine_block(self, difficulty, workers=MINING_WORKERS):
+        """Mines block using Proof-of-Work.
+
+        With workers != 1 the nonce search runs on a process pool
+        (0 = one process per CPU core).
+        """
+        from infosec_banking.models.miner import resolve_workers
+        workers = resolve_workers(workers)
+        if workers > 1:
+            return self._mine_parallel(difficulty, workers)
+
         target = '0' * difficulty
-        print_processing(f"Mining block #{self.index}", end="")
+        print_processing(f"Mining block #{self.index}")
         
         start_time = time.time()
         attempt = 0
-        while self.hash[:difficulty] != target:
+        # Only the nonce changes between attempts, so hash the rest once
+        state, suffix = hash_midstate(self.hash_fields())
+        block_hash = self.hash
+        while block_hash[:difficulty] != target:
             self.nonce += 1
-            self.hash = self.compute_hash()
+            block_hash = hash_with_nonce(state, suffix, self.nonce)
             attempt += 1
             if attempt % 500 == 0:
-                print_processing(f"Mining block #{self.index} ({attempt} attempts)", end="")
+                print_processing(f"Mining block #{self.index} ({attempt} attempts)", attempts=attempt)
+        self.hash = block_hash
         
         end_time = time.time()
-        print()
-        print_success(f"Block #{self.index} mined! Hash: {self.hash[:12]}... (Nonce: {self.nonce}, Time: {end_time-start_time:.2f}s)")
+        hashrate = (attempt + 1) / max(end_time - start_time, 1e-9)
+        print_success(f"Block #{self.index} mined! Hash: {self.hash[:12]}... (Nonce: {self.nonce}, Time: {end_time-start_time:.2f}s, {hashrate:,.0f} H/s)")
+        return self.hash
+
+    def _mine_parallel(self, difficulty, workers):
+        print_processing(f"Mining block #{self.index} on {workers} processes")
+        from infosec_banking.models.miner import get_miner
+        start_time = time.time()
+        miner = get_miner(workers)
+        self.nonce, self.hash, attempts = miner.mine(self.hash_fields(), difficulty, self.nonce)
+        end_time = time.time()
+        print_success(f"Block #{self.index} mined! Hash: {self.hash[:12]}... (Nonce: {self.nonce}, Time: {end_time-start_time:.2f}s, {miner.last_hashrate:,.0f} H/s over {attempts} attempts)")
         return self.hash
 
+    def header_dict(self):
+        """Returns block metadata without the transaction payload"""
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'account_mask': self.account_mask,
+            'tx_hash': self.tx_hash,
+            'previous_hash': self.previous_hash,
+            'nonce': self.nonce,
+            'hash': self.hash,
+            'tx_count': self.tx_count
+        }
+
     def to_dict(self):
         """Converts block to dictionary"""
-        return {
+        data = {
             'index': self.index,
             'timestamp': self.timestamp,
             'account_mask': self.account_mask,
@@ -66,6 +321,9 @@ class Block:
             'nonce': self.nonce,
             'hash': self.hash
         }
+        if self._transactions is not None:
+            data['transactions'] = self.transactions
+        return data
 
     @staticmethod
     def from_dict(data):
@@ -77,7 +335,9 @@ class Block:
             tx_hash=data['tx_hash'],
             previous_hash=data['previous_hash'],
             nonce=data.get('nonce', 0),
-            timestamp=data.get('timestamp')
+            timestamp=data.get('timestamp'),
+            transactions=data.get('transactions')
         )
-        block.hash = data.get('hash', block.compute_hash())
+        if 'hash' in data:
+            block.hash = data['hash']
         return block
@@ -1,23 +1,59 @@
+import bisect
 import hashlib
-from infosec_banking.models.block import Block
+import os
+from infosec_banking.models.account_state import AccountState
+from infosec_banking.models.block import Block, read_payload, payload_parties
+from infosec_banking.models.mempool import Mempool
+from infosec_banking.models.miner import resolve_workers
+from infosec_banking.models.verifier import verify_parallel, MIN_BLOCKS_PER_RANGE
 from infosec_banking.models.transaction import Transaction
+from infosec_banking.storage.backend import get_backend
+from infosec_banking.storage.pending_log import PendingLog
+from infosec_banking.storage.segments import SegmentStore, TieredChain
 from infosec_banking.storage.storage_manager import StorageManager
 from infosec_banking.utils.colors import print_header, print_error, print_success, print_warning, print_info
-from infosec_banking.config import LEDGER_FILE, DIFFICULTY
+from infosec_banking.config import DIFFICULTY, MINING_WORKERS, VERIFY_WORKERS, CHECKPOINT_FILE
+from infosec_banking.config import LEDGER_HOT_BLOCKS, LEDGER_SEGMENT_BLOCKS
 
 import threading
 
+def _signed_id(tx):
+    """Returns Transaction.signed_id() of a parsed payload, or None if it is not a signed transaction"""
+    if not tx or not tx.get('signature'):
+        return None
+    try:
+        return Transaction.from_dict(tx).signed_id()
+    except (KeyError, TypeError, ValueError):
+        return None
+
 class Blockchain:
     """Manages the blockchain"""
     
-    def __init__(self, ca, difficulty=DIFFICULTY):
+    def __init__(self, ca, difficulty=DIFFICULTY, mining_workers=MINING_WORKERS):
         self.chain = []
         self.difficulty = difficulty
+        self.mining_workers = mining_workers
         self.ca = ca # Reference to Certificate Authority for validation
         self.lock = threading.Lock()
+        self.listeners = [] # Callbacks invoked with each newly appended block
+        self.mempool = Mempool()
+        self.tx_heights = {} # tx_hash -> index of the block that holds it
+        self.tx_ids = {} # tx_id -> tx_hash, for plaintext payloads (mined or pending)
+        self.signed_ids = {} # Transaction.signed_id() -> tx_hash (mined or pending), to refuse replays
+        self.submit_lock = threading.Lock() # Makes submit()'s duplicate check, logging and queueing one step
+        self.pending_log = PendingLog()
+        self.account_heights = {} # account mask or id -> ascending indexes of blocks touching it
+        self.index_lock = threading.Lock()
+        self._indexed = 0 # Blocks below this height are in the indexes above
+        self.store = get_backend().open_ledger()
+        self.segments = SegmentStore() # Cold tier for the JSON ledger
+        self.state = AccountState()
+        self._miner_thread = None
+        self._miner_stop = threading.Event()
         self.load()
         if not self.chain:
             self._create_genesis_block()
+        self._restore_pending()
 
     def _create_genesis_block(self):
         """Creates genesis block"""
@@ -30,8 +66,8 @@ class Blockchain:
             previous_hash="0" * 64,
             nonce=0
         )
-        genesis_block.mine_block(self.difficulty)
-        self.chain.append(genesis_block)
+        genesis_block.mine_block(self.difficulty, self.mining_workers)
+        self._append(genesis_block)
         self.save()
 
     @property
@@ -39,66 +75,402 @@ class Blockchain:
         """Returns last block"""
         return self.chain[-1]
 
+    @property
+    def height(self):
+        """Number of blocks in the chain (index of the next block)"""
+        return len(self.chain)
+
+    def get_blocks(self, start=0, end=None):
+        """Returns blocks with start <= index < end (end defaults to the tip)"""
+        start = max(0, start)
+        if end is None or end > len(self.chain):
+            end = len(self.chain)
+        return self.chain[start:end]
+
     def add_block(self, account_mask, encrypted_tx_hex, tx_hash):
-        """Adds new block to chain"""
+        """Adds a transaction to the chain and returns the index of the block holding it"""
+        return self.commit([(account_mask, encrypted_tx_hex, tx_hash)])[0]
+
+    def add_blocks(self, entries):
+        """Adds several (account_mask, encrypted_tx_hex, tx_hash) entries; see commit()"""
+        return self.commit(entries)
+
+    def get_block(self, index):
+        """Returns the block at a height, or None"""
+        if 0 <= index < len(self.chain):
+            return self.chain[index]
+        return None
+
+    def find_transaction(self, tx_hash=None, tx_id=None):
+        """Looks up a mined transaction by hash or id.
+
+        Returns (block, (account_mask, payload, tx_hash)) or None.
+        """
+        if tx_hash is None:
+            tx_hash = self.resolve_tx_id(tx_id)
+        self._ensure_indexed()
+        block_index = self.tx_heights.get(tx_hash)
+        if block_index is None:
+            return None
+        block = self.chain[block_index]
+        for entry in block.entries():
+            if entry[2] == tx_hash:
+                return block, entry
+        return None
+
+    def get_account_blocks(self, account, start=0, limit=None):
+        """Returns the blocks that hold transactions for an account (mask or full id)"""
+        self._ensure_indexed()
+        heights = self.account_heights.get(account, [])
+        if start:
+            heights = heights[bisect.bisect_left(heights, start):]
+        if limit is not None:
+            heights = heights[:limit]
+        return [self.chain[i] for i in heights]
+
+    def resolve_tx_id(self, tx_id):
+        """Returns the tx_hash of a mined or pending plaintext transaction, or None"""
+        self._ensure_indexed()
+        return self.tx_ids.get(tx_id)
+
+    def has_transaction(self, tx_hash, signed_id=None):
+        """True if the transaction (by entry hash or signed content) is on-chain or in the mempool"""
+        self._ensure_indexed()
+        if signed_id is not None and signed_id in self.signed_ids:
+            return True
+        return tx_hash in self.tx_heights or tx_hash in self.mempool
+
+    def submit(self, account_mask, encrypted_tx_hex, tx_hash):
+        """Queues a verified transaction for a later block; see submit_many()"""
+        return self.submit_many([(account_mask, encrypted_tx_hex, tx_hash)])[0]
+
+    def submit_many(self, entries):
+        """Queues verified transactions for later blocks.
+
+        Accepted entries are fsynced to the pending log before this returns,
+        so a receipt sent afterwards survives a crash. Returns one bool per
+        entry: False if it is a duplicate or the mempool is full.
+        """
+        self._ensure_indexed()
+        candidates = []
+        for entry in entries:
+            tx = read_payload(entry[1])
+            candidates.append((entry, tx, _signed_id(tx)))
+
+        with self.submit_lock:
+            results, accepted, seen = [], [], set()
+            room = self.mempool.room()
+            for entry, tx, signed_id in candidates:
+                ok = (len(accepted) < room and entry[2] not in seen
+                      and (signed_id is None or signed_id not in seen)
+                      and not self.has_transaction(entry[2], signed_id))
+                if ok:
+                    accepted.append((entry, tx, signed_id))
+                    seen.add(entry[2])
+                    if signed_id is not None:
+                        seen.add(signed_id)
+                results.append(ok)
+            if accepted:
+                self.pending_log.append([entry for entry, _, _ in accepted])
+                for entry, tx, signed_id in accepted:
+                    self._queue(entry, tx, signed_id)
+        return results
+
+    def _queue(self, entry, tx, signed_id):
+        """Adds an entry to the mempool and the id indexes (caller holds submit_lock)"""
+        self.mempool.add(entry)
+        if signed_id is not None:
+            self.signed_ids[signed_id] = entry[2]
+        if tx and 'tx_id' in tx:
+            self.tx_ids[tx['tx_id']] = entry[2]
+
+    def _restore_pending(self):
+        """Re-queues transactions that were accepted but not mined before the last shutdown"""
+        entries = self.pending_log.load()
+        if not entries:
+            return
+        restored = 0
+        with self.submit_lock:
+            for entry in entries:
+                tx = read_payload(entry[1])
+                signed_id = _signed_id(tx)
+                if not self.has_transaction(entry[2], signed_id) and self.mempool.room():
+                    self._queue(entry, tx, signed_id)
+                    restored += 1
+            self.pending_log.rewrite(self.mempool.entries())
+        if restored:
+            print_info(f"Restored {restored} pending transactions from {os.path.basename(self.pending_log.path)}")
+
+    def commit(self, entries):
+        """Queues entries and mines until every one of them is on-chain.
+
+        Whatever else is pending is mined alongside them, up to
+        MEMPOOL_MAX_BLOCK_TXS per block, and the ledger is saved once.
+        Returns each entry's block index, or None if submit() rejected it.
+        """
+        accepted = [entry[2] for entry, ok in zip(entries, self.submit_many(entries)) if ok]
+
         with self.lock:
-            new_block = Block(
-                index=len(self.chain),
-                account_mask=account_mask,
-                encrypted_tx_hex=encrypted_tx_hex,
-                tx_hash=tx_hash,
-                previous_hash=self.last_block.hash
-            )
-            new_block.mine_block(self.difficulty)
-            self.chain.append(new_block)
-            self.save()
-            return new_block.index
+            new_blocks = []
+            try:
+                while self.mempool and any(tx_hash not in self.tx_heights for tx_hash in accepted):
+                    new_blocks.append(self._mine_next_block())
+            finally:
+                # Blocks mined before a failure are on-chain and must reach the ledger
+                if new_blocks:
+                    self._persist(new_blocks)
+                    for block in new_blocks:
+                        self._notify(block)
+            accepted = set(accepted)
+            return [self.tx_heights.get(entry[2]) if entry[2] in accepted else None for entry in entries]
+
+    def mine_pending(self, force=False):
+        """Mines one block from the mempool once it is ready (or whenever non-empty if force).
+
+        Returns the new block, or None if nothing was mined.
+        """
+        if not (self.mempool.ready() or (force and self.mempool)):
+            return None
+        with self.lock:
+            if not self.mempool:
+                return None
+            block = self._mine_next_block()
+            self._persist([block])
+            self._notify(block)
+            return block
+
+    def start_miner(self):
+        """Starts a background thread that mines the mempool as blocks become ready"""
+        if self._miner_thread is not None:
+            return
+        self._miner_stop.clear()
+        self._miner_thread = threading.Thread(target=self._miner_loop, name="block-miner", daemon=True)
+        self._miner_thread.start()
+
+    def stop_miner(self, drain=True):
+        """Stops the background miner, first mining whatever is pending if drain"""
+        if self._miner_thread is None:
+            return
+        self._miner_stop.set()
+        self._miner_thread.join()
+        self._miner_thread = None
+        while drain and self.mine_pending(force=True) is not None:
+            pass
+
+    def _miner_loop(self):
+        self._ensure_indexed() # Build the lookup indexes off the request path after a load
+        while not self._miner_stop.is_set():
+            try:
+                # Short timeout so stop_miner() is noticed promptly
+                if self.mempool.wait_ready(timeout=0.5):
+                    self.mine_pending()
+            except Exception as e:
+                print_error(f"Background miner error: {e}")
+                self._miner_stop.wait(1)
+
+    def tx_status(self, tx_hash=None, tx_id=None):
+        """Returns a status dict for a transaction hash (or id): mined, pending or unknown"""
+        if tx_hash is None:
+            tx_hash = self.resolve_tx_id(tx_id)
+        self._ensure_indexed()
+        block_index = self.tx_heights.get(tx_hash)
+        if block_index is not None:
+            return {
+                "tx_status": "mined",
+                "block_index": block_index,
+                "block_hash": self.chain[block_index].hash,
+                "confirmations": len(self.chain) - block_index
+            }
+        if tx_hash in self.mempool:
+            return {"tx_status": "pending"}
+        return {"tx_status": "unknown"}
+
+    def _mine_next_block(self):
+        """Mines the next mempool batch into a block and appends it (caller holds the lock)"""
+        entries = self.mempool.take()
+        try:
+            block = Block.from_entries(len(self.chain), entries, self.last_block.hash)
+            block.mine_block(self.difficulty, self.mining_workers)
+            self._append(block)
+        except Exception:
+            # Still pending (and still in the pending log); the next attempt retries them
+            self.mempool.requeue(entries)
+            raise
+        self.mempool.release(entries)
+        return block
+
+    def _append(self, block):
+        self.state.apply_block(block) # Raises before the chain changes if block is out of sequence
+        self.chain.append(block)
+        if self._indexed == block.index:
+            self._ensure_indexed()
+
+    def _ensure_indexed(self):
+        """Indexes blocks appended or loaded since the last call.
+
+        After a load the first lookup (or the background miner) indexes the
+        whole chain; from then on each new block is indexed as it is appended.
+        """
+        if self._indexed == len(self.chain):
+            return
+        with self.index_lock:
+            while self._indexed < len(self.chain):
+                self._index(self.chain[self._indexed])
+                self._indexed += 1
+
+    def _index(self, block):
+        for account_mask, payload, tx_hash in block.entries():
+            self.tx_heights[tx_hash] = block.index
+            accounts = {account_mask}
+            tx = read_payload(payload)
+            if tx:
+                if 'tx_id' in tx:
+                    self.tx_ids[tx['tx_id']] = tx_hash
+                signed_id = _signed_id(tx)
+                if signed_id is not None:
+                    self.signed_ids[signed_id] = tx_hash
+                accounts.update(payload_parties(tx))
+            for account in accounts:
+                if account is None:
+                    continue
+                heights = self.account_heights.setdefault(account, [])
+                if not heights or heights[-1] != block.index:
+                    heights.append(block.index)
+
+    def subscribe(self, callback):
+        """Registers callback(block) to run after each block is appended.
+
+        Callbacks run on the appending thread while the chain lock is held,
+        so they must be quick and must not block.
+        """
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """Removes a callback registered with subscribe()"""
+        try:
+            self.listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self, block):
+        for callback in list(self.listeners):
+            try:
+                callback(block)
+            except Exception as e:
+                print_warning(f"Block listener failed: {e}")
+
+    def _hot_blocks(self):
+        """Blocks kept in the main ledger file (all of them unless cold segments are in use)"""
+        return self.chain.hot if isinstance(self.chain, TieredChain) else self.chain
+
+    def _needs_sealing(self):
+        return (LEDGER_HOT_BLOCKS and isinstance(self.chain, TieredChain)
+                and len(self.chain.hot) >= LEDGER_HOT_BLOCKS + LEDGER_SEGMENT_BLOCKS)
+
+    def _seal_cold_blocks(self):
+        """Moves the oldest hot blocks into cold segments, keeping LEDGER_HOT_BLOCKS hot"""
+        while len(self.chain.hot) >= LEDGER_HOT_BLOCKS + LEDGER_SEGMENT_BLOCKS:
+            self.chain.seal(LEDGER_SEGMENT_BLOCKS)
+        self.save()
 
     def save(self):
-        """Saves blockchain to file"""
-        chain_list = [block.to_dict() for block in self.chain]
-        StorageManager.atomic_write_json(LEDGER_FILE, chain_list)
+        """Saves the blockchain to file (also compacts the ledger log)"""
+        chain_list = [block.to_dict() for block in self._hot_blocks()]
+        self.store.rewrite(chain_list)
+        self.state.save()
+
+    def _persist(self, new_blocks):
+        """Appends only the new blocks to the ledger log, compacting it periodically"""
+        self.store.append([block.to_dict() for block in new_blocks])
+        if self._needs_sealing():
+            self._seal_cold_blocks()
+        elif self.store.needs_compaction():
+            self.save()
+        elif self.state.needs_snapshot():
+            self.state.save()
+        with self.submit_lock:
+            # Mined entries are now in the ledger; keep the log to what is still pending
+            if self.pending_log.needs_compaction(len(self.mempool)):
+                self.pending_log.rewrite(self.mempool.entries())
 
     def load(self):
         """Loads blockchain from file"""
-        chain_list = StorageManager.load_json(LEDGER_FILE, default_data=[])
-        self.chain = []
-        for block_data in chain_list:
-            try:
-                block = Block.from_dict(block_data)
-                self.chain.append(block)
-            except KeyError as e:
-                print_error(f"Skipped corrupted block: Missing {e}")
+        self.tx_heights = {}
+        self.tx_ids = {}
+        self.signed_ids = {}
+        self.account_heights = {}
+        self._indexed = 0
+        if self.store.lazy:
+            # Blocks are decoded from the mapped ledger on access
+            self.chain = self.store.open_chain(Block.from_dict)
+        else:
+            if self.store.tiered:
+                self.segments.load()
+            hot = []
+            for block_data in self.store.load(start=self.segments.height):
+                try:
+                    hot.append(Block.from_dict(block_data))
+                except KeyError as e:
+                    print_error(f"Skipped corrupted block: Missing {e}")
+            if self.store.tiered and (self.segments.height or LEDGER_HOT_BLOCKS):
+                # Sealed blocks stay on disk and are decompressed when read
+                self.chain = TieredChain(self.segments, hot, Block.from_dict)
+            else:
+                self.chain = hot
+        # Balances come from the last snapshot plus the blocks after it
+        self.state.load(self.chain)
 
         print_info(f"Loaded {len(self.chain)} blocks from ledger")
 
-    def is_valid(self, verbose=True):
-        """Verifies blockchain integrity"""
+    def _load_checkpoint(self):
+        """Returns the last verified height if the checkpoint still matches this chain, else 0"""
+        checkpoint = StorageManager.load_json(CHECKPOINT_FILE, default_data={})
+        height = checkpoint.get('height', 0)
+        if not 0 < height <= len(self.chain):
+            return 0
+        anchor = self.chain[height - 1]
+        # The tip hash commits to every header before it through previous_hash
+        if anchor.hash != checkpoint.get('tip_hash') or anchor.compute_hash() != anchor.hash:
+            return 0
+        return height
+
+    def _save_checkpoint(self, height):
+        StorageManager.atomic_write_json(CHECKPOINT_FILE, {
+            'height': height,
+            'tip_hash': self.chain[height - 1].hash
+        })
+
+    def is_valid(self, verbose=True, full=False, workers=VERIFY_WORKERS):
+        """Verifies blockchain integrity.
+
+        By default only blocks appended since the last verified checkpoint are
+        checked; full=True re-verifies from genesis (this also catches payload
+        edits inside already-checkpointed blocks). With workers > 1, long
+        ranges are split across a process pool.
+        """
         if verbose:
             print_header("Verifying Blockchain Integrity")
-        
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
-            recomputed_hash = current_block.compute_hash()
-
-            if current_block.hash != recomputed_hash:
-                if verbose:
-                    print_error(f"Block #{i} hash mismatch - TAMPERED")
-                return False, i
-
-            if current_block.previous_hash != previous_block.hash:
-                if verbose:
-                    print_error(f"Block #{i} chain link broken - TAMPERED")
-                return False, i
-
-            target = '0' * self.difficulty
-            if current_block.hash[:self.difficulty] != target:
-                if verbose:
-                    print_error(f"Block #{i} failed PoW check - TAMPERED")
-                return False, i
 
+        height = len(self.chain)
+        start = 1 if full else max(1, self._load_checkpoint())
+        if verbose and start > 1:
+            print_info(f"Blocks #0-#{start - 1} verified at checkpoint; checking {height - start} new block(s)")
+
+        workers = resolve_workers(workers)
+        if workers > 1 and height - start >= workers * MIN_BLOCKS_PER_RANGE:
+            bad_index = verify_parallel(self.chain, start, height, self.difficulty, workers)
+        else:
+            bad_index = next((i for i in range(start, height)
+                              if self.chain[i].check(self.chain[i - 1].hash, self.difficulty)), -1)
+
+        if bad_index != -1:
+            if verbose:
+                reason = self.chain[bad_index].check(self.chain[bad_index - 1].hash, self.difficulty)
+                print_error(f"Block #{bad_index} {reason} - TAMPERED")
+            return False, bad_index
+
+        if height > start or full:
+            self._save_checkpoint(height)
         if verbose:
             print_success("All blocks verified - Blockchain is valid")
         return True, -1
@@ -0,0 +1,93 @@
+import time
+import threading
+from collections import deque
+from infosec_banking.config import MEMPOOL_MAX_BLOCK_TXS, MEMPOOL_MAX_BLOCK_AGE, MEMPOOL_MAX_SIZE
+
+class Mempool:
+    """Verified transactions waiting to be mined into a block.
+
+    Entries are (account_mask, encrypted_tx_hex, tx_hash) tuples, the same
+    shape Blockchain stores on-chain. A tx_hash stays known to the pool from
+    add() until release(), so it cannot be queued twice while being mined.
+    """
+
+    def __init__(self, max_block_txs=MEMPOOL_MAX_BLOCK_TXS, max_block_age=MEMPOOL_MAX_BLOCK_AGE, max_size=MEMPOOL_MAX_SIZE):
+        self.max_block_txs = max_block_txs
+        self.max_block_age = max_block_age
+        self.max_size = max_size
+        self.pending = deque() # (entry, arrival time)
+        self.known_hashes = set()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __contains__(self, tx_hash):
+        return tx_hash in self.known_hashes
+
+    def room(self):
+        """Number of entries that can still be added"""
+        with self.lock:
+            return self.max_size - len(self.pending)
+
+    def entries(self):
+        """Returns the entries waiting to be taken, oldest first"""
+        with self.lock:
+            return [entry for entry, _ in self.pending]
+
+    def add(self, entry):
+        """Queues an entry; returns False if it is a duplicate or the pool is full"""
+        with self.lock:
+            tx_hash = entry[2]
+            if tx_hash in self.known_hashes or len(self.pending) >= self.max_size:
+                return False
+            self.pending.append((entry, time.monotonic()))
+            self.known_hashes.add(tx_hash)
+            self.changed.notify_all()
+            return True
+
+    def _seconds_until_ready(self):
+        """0 if a block should be mined now, None if empty, else seconds to wait (lock held)"""
+        if len(self.pending) >= self.max_block_txs:
+            return 0
+        if not self.pending:
+            return None
+        return max(0, self.pending[0][1] + self.max_block_age - time.monotonic())
+
+    def ready(self):
+        """True once a full block is waiting or the oldest entry has waited max_block_age"""
+        with self.lock:
+            return self._seconds_until_ready() == 0
+
+    def wait_ready(self, timeout):
+        """Blocks until ready() or the timeout expires; returns ready()"""
+        deadline = time.monotonic() + timeout
+        with self.changed:
+            while True:
+                until_ready = self._seconds_until_ready()
+                if until_ready == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.changed.wait(remaining if until_ready is None else min(remaining, until_ready))
+
+    def take(self):
+        """Removes and returns up to max_block_txs entries, oldest first"""
+        with self.lock:
+            count = min(self.max_block_txs, len(self.pending))
+            return [self.pending.popleft()[0] for _ in range(count)]
+
+    def requeue(self, entries):
+        """Puts entries from take() back at the front, e.g. after mining them failed"""
+        with self.lock:
+            now = time.monotonic()
+            self.pending.extendleft((entry, now) for entry in reversed(entries))
+            self.changed.notify_all()
+
+    def release(self, entries):
+        """Forgets entries once they are on-chain (or dropped)"""
+        with self.lock:
+            for entry in entries:
+                self.known_hashes.discard(entry[2])
@@ -0,0 +1,91 @@
+import os
+import time
+import atexit
+import threading
+from infosec_banking.models.block import hash_midstate, hash_with_nonce
+from infosec_banking.utils.processes import worker_context
+
+_stop_event = None # Set in each worker process by _init_worker
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+def _search(header, difficulty, start, step, check_every=1024):
+    """Tries nonces start, start+step, ... until one meets the target or another worker wins.
+
+    Returns (nonce, hash, attempts); nonce and hash are None if stopped early.
+    """
+    target = '0' * difficulty
+    state, suffix = hash_midstate(header)
+    nonce = start
+    attempts = 0
+    while True:
+        block_hash = hash_with_nonce(state, suffix, nonce)
+        attempts += 1
+        if block_hash[:difficulty] == target:
+            _stop_event.set()
+            return nonce, block_hash, attempts
+        nonce += step
+        if attempts % check_every == 0 and _stop_event.is_set():
+            return None, None, attempts
+
+class ParallelMiner:
+    """Process pool that searches interleaved slices of the nonce space.
+
+    Worker i tries start+i, start+i+N, ...; the first hit sets a shared
+    event and the other workers stop at their next check.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        context = worker_context() # Never fork: the miner starts while server threads hold locks
+        self.stop_event = context.Event()
+        self.pool = context.Pool(workers, initializer=_init_worker, initargs=(self.stop_event,))
+        self.lock = threading.Lock()
+        self.last_hashrate = 0.0
+
+    def mine(self, header, difficulty, start_nonce=0):
+        """Returns (nonce, hash, attempts) for a header dict (nonce is ignored)"""
+        with self.lock:
+            self.stop_event.clear()
+            start_time = time.time()
+            results = [
+                self.pool.apply_async(_search, (header, difficulty, start_nonce + i, self.workers))
+                for i in range(self.workers)
+            ]
+
+            found = None
+            attempts = 0
+            for result in results:
+                nonce, block_hash, tried = result.get()
+                attempts += tried
+                if nonce is not None and found is None:
+                    found = (nonce, block_hash)
+
+            elapsed = max(time.time() - start_time, 1e-9)
+            self.last_hashrate = attempts / elapsed
+            return found[0], found[1], attempts
+
+    def close(self):
+        self.pool.terminate()
+
+_miners = {}
+_miners_lock = threading.Lock()
+
+def resolve_workers(workers):
+    """Maps the MINING_WORKERS setting to a process count (0 = one per core)"""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def get_miner(workers):
+    """Returns the shared ParallelMiner for this worker count, starting it on first use"""
+    with _miners_lock:
+        miner = _miners.get(workers)
+        if miner is None:
+            miner = _miners[workers] = ParallelMiner(workers)
+        return miner
+
+@atexit.register
+def _shutdown_miners():
+    for miner in _miners.values():
+        miner.close()
@@ -3,9 +3,10 @@ import json
 import hashlib
 import os
 import base64
-from infosec_banking.crypto.rsa_manager import RSAManager
+from infosec_banking.crypto.signature import SignatureManager
 from infosec_banking.crypto.crypto_manager import CryptoManager
 from infosec_banking.crypto.certificate import Certificate
+from infosec_banking.utils.colors import print_warning
 
 class Transaction:
     """Represents a financial transaction with Digital Signature and Hybrid Encryption"""
@@ -19,7 +20,7 @@ class Transaction:
         self.memo = memo # This will be ciphertext if encrypted
         self.timestamp = timestamp if timestamp else datetime.datetime.now().isoformat()
         self.signature = signature
-        self.encrypted_aes_key = encrypted_aes_key # RSA-Encrypted AES Key
+        self.encrypted_aes_key = encrypted_aes_key # AES Key wrapped for the receiver (RSA-OAEP or ECDH)
         self.iv = iv # AES IV
 
     def to_dict(self):
@@ -76,10 +77,14 @@ class Transaction:
         }
         return json.dumps(data, sort_keys=True, separators=(',', ':'))
 
+    def signed_id(self):
+        """Hash of the signed content: the same for any re-encoding or re-signing of this transaction"""
+        return hashlib.sha256(self.get_data_to_sign().encode('utf-8')).hexdigest()
+
     def sign(self, private_key_pem):
-        """Signs the transaction"""
+        """Signs the transaction with the algorithm of the sender's key"""
         data = self.get_data_to_sign()
-        self.signature = RSAManager.sign(private_key_pem, data)
+        self.signature = SignatureManager.sign(private_key_pem, data)
 
     def is_valid(self, ca):
         """Verifies transaction signature and certificate"""
@@ -95,26 +100,31 @@ class Transaction:
             cert_obj = Certificate.from_dict(cert_obj)
         
         if not ca.verify_certificate(cert_obj):
-            print(f"Invalid Certificate for {cert_obj.subject}")
+            print_warning(f"Invalid Certificate for {cert_obj.subject}")
             return False
 
-        # 2. Verify Transaction Signature using Cert's Public Key
+        # 2. Verify Transaction Signature using Cert's Public Key and recorded algorithm
         data = self.get_data_to_sign()
-        return RSAManager.verify(cert_obj.public_key, data, self.signature)
+        return SignatureManager.verify(cert_obj.public_key, data, self.signature, cert_obj.key_algorithm)
 
     def encrypt_memo(self, receiver_public_key_pem):
-        """Hybrid Encrypts the memo: AES(memo) + RSA(aes_key)"""
+        """Hybrid Encrypts the memo: AES(memo) + RSA-OAEP or ECDH(aes_key).
+
+        Raises ValueError for an Ed25519 receiver key, which can only sign.
+        """
         # 1. Generate AES Key (32 bytes for AES-256)
         aes_key = os.urandom(32)
         
-        # 2. Encrypt Memo with AES
+        # 2. Wrap AES Key for the Receiver first, so an unusable key leaves the memo untouched
+        encrypted_aes_key = SignatureManager.wrap_key(receiver_public_key_pem, aes_key)
+
+        # 3. Encrypt Memo with AES
         # CryptoManager.encrypt returns iv + ciphertext
         encrypted_data = CryptoManager.encrypt(self.memo, aes_key)
         self.iv = base64.b64encode(encrypted_data[:16]).decode('utf-8') # Extract IV
         self.memo = base64.b64encode(encrypted_data[16:]).decode('utf-8') # Store Ciphertext in memo field
         
-        # 3. Encrypt AES Key with Receiver's RSA Public Key
-        self.encrypted_aes_key = RSAManager.encrypt(receiver_public_key_pem, aes_key)
+        self.encrypted_aes_key = encrypted_aes_key
 
     def decrypt_memo(self, receiver_private_key_pem):
         """Hybrid Decrypts the memo"""
@@ -122,8 +132,8 @@ class Transaction:
             return self.memo # Not encrypted
             
         try:
-            # 1. Decrypt AES Key with RSA
-            aes_key = RSAManager.decrypt(receiver_private_key_pem, self.encrypted_aes_key)
+            # 1. Unwrap AES Key with the Receiver's Private Key
+            aes_key = SignatureManager.unwrap_key(receiver_private_key_pem, self.encrypted_aes_key)
             if not aes_key:
                 return "[Decryption Failed: Invalid Key]"
                 
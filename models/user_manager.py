@@ -1,8 +1,10 @@
 import hashlib
 import datetime
-import time
 from infosec_banking.storage.storage_manager import StorageManager
-from infosec_banking.utils.colors import print_processing, print_success, print_error
+from infosec_banking.storage.backend import get_backend
+from infosec_banking.crypto.crypto_manager import CryptoManager
+from infosec_banking.crypto.session_keys import SessionKeyCache
+from infosec_banking.utils.colors import print_processing, print_success, print_error, pause
 from infosec_banking.config import USERS_FILE, DEFAULT_BALANCE, RESERVED_USERNAMES
 
 class UserManager:
@@ -11,6 +13,8 @@ class UserManager:
     def __init__(self):
         self.users = {}
         self.logged_in_user_id = None
+        self.session_keys = SessionKeyCache()
+        self.table = get_backend().open_table('users', USERS_FILE)
         self.load()
 
     def _hash_password(self, password):
@@ -20,7 +24,7 @@ class UserManager:
     def register(self, user_id, password):
         """Registers a new user"""
         print_processing("Validating registration...")
-        time.sleep(0.2)
+        pause(0.2)
         
         if user_id.upper() in RESERVED_USERNAMES:
             print_error(f"Username '{user_id}' is reserved")
@@ -31,7 +35,7 @@ class UserManager:
             return False, "User ID already exists."
         
         print_processing("Hashing password...")
-        time.sleep(0.1)
+        pause(0.1)
         hashed_password = self._hash_password(password)
         
         self.users[user_id] = {
@@ -40,7 +44,7 @@ class UserManager:
             "active_session": False,
             "created_at": datetime.datetime.now().isoformat()
         }
-        self.save()
+        self.save(user_id)
         print_success(f"User '{user_id}' registered with balance ${DEFAULT_BALANCE:.2f}")
         StorageManager.log_operation(user_id, "Registration successful")
         return True, f"Welcome! Your initial balance: ${DEFAULT_BALANCE:.2f}"
@@ -55,7 +59,7 @@ class UserManager:
     def authenticate(self, user_id, password):
         """Authenticates user credentials"""
         print_processing("Authenticating user...")
-        time.sleep(0.2)
+        pause(0.2)
         
         user_data = self.users.get(user_id)
         
@@ -75,10 +79,11 @@ class UserManager:
             return False, "User already logged in elsewhere."
         
         print_processing("Starting session...")
-        time.sleep(0.1)
+        pause(0.1)
         user_data['active_session'] = True
         self.logged_in_user_id = user_id
-        self.save()
+        self.session_keys.put(user_id, CryptoManager.derive_key(password))
+        self.save(user_id)
         print_success(f"Welcome, {user_id}!")
         StorageManager.log_operation(user_id, "Login successful")
         return True, f"Welcome, {user_id}. Balance: ${self.get_balance(user_id):.2f}"
@@ -86,13 +91,14 @@ class UserManager:
     def logout(self, user_id):
         """Logs out a user"""
         print_processing("Ending session...")
-        time.sleep(0.1)
+        pause(0.1)
         
+        self.session_keys.wipe(user_id)
         if user_id in self.users:
             self.users[user_id]['active_session'] = False
             if self.logged_in_user_id == user_id:
                 self.logged_in_user_id = None
-            self.save()
+            self.save(user_id)
             print_success("Logged out successfully")
             StorageManager.log_operation(user_id, "Logout successful")
             return True, "Session ended."
@@ -101,13 +107,21 @@ class UserManager:
     def force_logout_all(self):
         """Force logout all sessions (recovery)"""
         print_processing("Forcing logout of all sessions...")
-        time.sleep(0.1)
+        pause(0.1)
+        self.session_keys.wipe_all()
         for user_id in self.users:
             self.users[user_id]['active_session'] = False
         self.logged_in_user_id = None
         self.save()
         print_success("All sessions terminated")
 
+    def session_key(self, user_id, password):
+        """Returns the key derived at login while the session lasts, else derives it from the password"""
+        key_bytes = self.session_keys.get(user_id)
+        if key_bytes is None:
+            key_bytes = CryptoManager.derive_key(password)
+        return key_bytes
+
     def get_balance(self, user_id):
         """Gets user balance"""
         return self.users.get(user_id, {}).get('balance', 0.0)
@@ -125,10 +139,11 @@ class UserManager:
         return True
 
     def load(self):
-        """Loads users from file"""
-        data = StorageManager.load_json(USERS_FILE, default_data={})
-        self.users = data
+        """Loads users from storage"""
+        self.users = self.table.load()
 
-    def save(self):
-        """Saves users to file"""
-        StorageManager.atomic_write_json(USERS_FILE, self.users)
+    def save(self, *user_ids):
+        """Saves the given users (all users if none are given) in one write"""
+        if not user_ids:
+            user_ids = self.users.keys()
+        self.table.put_many({user_id: self.users[user_id] for user_id in user_ids if user_id in self.users})
@@ -0,0 +1,40 @@
+from infosec_banking.models.block import Block
+from infosec_banking.utils.processes import get_pool
+
+# Below this many blocks per worker, process start-up costs more than it saves
+MIN_BLOCKS_PER_RANGE = 256
+
+def _verify_range(block_dicts, previous_hash, difficulty):
+    """Checks consecutive blocks, starting from the stored hash of the block before them.
+
+    Returns the index of the first bad block, or -1.
+    """
+    for data in block_dicts:
+        block = Block.from_dict(data)
+        if block.check(previous_hash, difficulty):
+            return block.index
+        previous_hash = block.hash
+    return -1
+
+def verify_parallel(chain, start, end, difficulty, workers):
+    """Verifies chain[start:end] across a process pool.
+
+    The range is cut into slices; each worker recomputes hashes, Merkle roots
+    and PoW for its slice and checks every previous_hash link inside it. The
+    link into each slice is checked against the stored hash of the block just
+    before it, which stitches the slices together. Returns the index of the
+    first bad block (the same one a serial scan reports), or -1.
+    """
+    slices = workers * 4
+    size = max(1, -(-(end - start) // slices))
+    bounds = [(a, min(a + size, end)) for a in range(start, end, size)]
+
+    pool = get_pool(workers) # Shared and kept running, so repeat audits skip process start-up
+    futures = [
+        pool.submit(_verify_range, [block.to_dict() for block in chain[a:b]], chain[a - 1].hash, difficulty)
+        for a, b in bounds
+    ]
+    bad = [f.result() for f in futures]
+
+    failures = [index for index in bad if index != -1]
+    return min(failures) if failures else -1
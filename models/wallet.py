@@ -1,13 +1,15 @@
 import os
-from infosec_banking.crypto.rsa_manager import RSAManager
+from infosec_banking.crypto.signature import SignatureManager
 from infosec_banking.crypto.certificate import Certificate
-from infosec_banking.utils.colors import print_success, print_info
+from infosec_banking.utils.colors import print_success, print_info, print_error
+from infosec_banking.config import WALLET_KEY_ALGORITHM
 
 class Wallet:
-    """User Wallet managing RSA Keys and Certificate"""
+    """User Wallet managing its signing keys (RSA, Ed25519 or ECDSA P-256) and Certificate"""
     
-    def __init__(self, user_id):
+    def __init__(self, user_id, algorithm=WALLET_KEY_ALGORITHM):
         self.user_id = user_id
+        self.algorithm = algorithm # Only used when new keys are generated
         self.private_key = None
         self.public_key = None
         self.certificate = None
@@ -30,11 +32,12 @@ class Wallet:
             # print_info(f"Loaded keys for {self.user_id}")
         else:
             # print_info(f"Generating new keys for {self.user_id}...")
-            self.private_key, self.public_key = RSAManager.generate_key_pair()
+            self.private_key, self.public_key = SignatureManager.generate_key_pair(self.algorithm)
             os.makedirs(key_dir, exist_ok=True)
             with open(priv_path, 'w') as f: f.write(self.private_key)
             with open(pub_path, 'w') as f: f.write(self.public_key)
             # print_success(f"Keys saved for {self.user_id}")
+        self.algorithm = SignatureManager.algorithm_of(self.public_key)
         
         # Load Certificate if exists
         cert_path = f"{key_dir}/certificate.json"
@@ -63,4 +66,4 @@ class Wallet:
 
     def sign_data(self, data):
         """Signs arbitrary data"""
-        return RSAManager.sign(self.private_key, data)
+        return SignatureManager.sign(self.private_key, data)
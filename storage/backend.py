@@ -0,0 +1,71 @@
+from infosec_banking.storage.storage_manager import StorageManager
+from infosec_banking.config import STORAGE_BACKEND
+
+class StorageBackend:
+    """Where UserManager, CertificateAuthority and Blockchain keep their records.
+
+    A backend hands out keyed tables (users, certificates) and the block store
+    used by Blockchain. Tables support row-level writes; how cheap those are
+    depends on the backend.
+    """
+
+    def open_table(self, name, json_path):
+        """Returns the table `name`; json_path is its file in the JSON layout"""
+        raise NotImplementedError
+
+    def open_ledger(self):
+        """Returns the block store (LedgerLog, BinaryLedger or SqliteLedger)"""
+        raise NotImplementedError
+
+class JsonTable:
+    """A table kept as one JSON object file; every write rewrites the file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = {}
+
+    def load(self):
+        """Returns all rows as a dict; the table keeps a reference to it"""
+        self.rows = StorageManager.load_json(self.path, default_data={})
+        return self.rows
+
+    def put(self, key, record):
+        self.put_many({key: record})
+
+    def put_many(self, records):
+        self.rows.update(records)
+        StorageManager.atomic_write_json(self.path, self.rows)
+
+    def delete(self, key):
+        if self.rows.pop(key, None) is not None:
+            StorageManager.atomic_write_json(self.path, self.rows)
+
+class JsonBackend(StorageBackend):
+    """The original layout: users.json, certificates.json and the ledger files"""
+
+    def open_table(self, name, json_path):
+        return JsonTable(json_path)
+
+    def open_ledger(self):
+        from infosec_banking.config import LEDGER_FORMAT
+        if LEDGER_FORMAT == 'binary':
+            from infosec_banking.storage.binary_ledger import BinaryLedger
+            return BinaryLedger()
+        from infosec_banking.storage.ledger_log import LedgerLog
+        return LedgerLog()
+
+_backends = {}
+
+def get_backend(kind=STORAGE_BACKEND):
+    """Returns the shared backend instance of a kind ('json' or 'sqlite')"""
+    backend = _backends.get(kind)
+    if backend is None:
+        if kind == 'sqlite':
+            from infosec_banking.storage.sqlite_backend import SqliteBackend
+            backend = SqliteBackend()
+        elif kind == 'json':
+            backend = JsonBackend()
+        else:
+            raise ValueError(f"Unknown storage backend '{kind}'")
+        _backends[kind] = backend
+    return backend
@@ -0,0 +1,262 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from infosec_banking.storage.segments import read_json_ledger
+from infosec_banking.utils.colors import print_info, print_success, print_warning, set_reporter, ConsoleReporter
+from infosec_banking.config import LEDGER_FILE, LEDGER_LOG_FILE, LEDGER_SEGMENT_DIR
+from infosec_banking.config import LEDGER_DATA_FILE, LEDGER_INDEX_FILE, LEDGER_CACHE_BLOCKS
+
+RECORD_HEADER = struct.Struct('!II') # body length, crc32 of body
+INDEX_ENTRY = struct.Struct('!Q') # offset of block N's record in the data file
+
+def _fsync_write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+class LazyChain:
+    """Sequence of blocks backed by a BinaryLedger; blocks are decoded only when accessed.
+
+    Blocks appended but not yet persisted are held in memory until the
+    ledger has written them. A small LRU of decoded blocks keeps the tip hot.
+    """
+
+    def __init__(self, ledger, decode, cache_size=LEDGER_CACHE_BLOCKS):
+        self.ledger = ledger
+        self.decode = decode
+        self.cache_size = cache_size
+        self._pending = []
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self):
+        pending = self._pending
+        return pending[-1].index + 1 if pending else self.ledger.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("block index out of range")
+        pending = self._pending
+        if pending and i >= pending[0].index:
+            return pending[i - pending[0].index]
+
+        with self._cache_lock:
+            block = self._cache.get(i)
+            if block is not None:
+                self._cache.move_to_end(i)
+                return block
+        block = self.decode(self.ledger.read(i))
+        self._remember(i, block)
+        return block
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, block):
+        self._pending.append(block)
+
+    def _remember(self, i, block):
+        with self._cache_lock:
+            self._cache[i] = block
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _stored(self):
+        """Moves pending blocks the ledger has now written into the decoded cache"""
+        keep = []
+        for block in self._pending:
+            if block.index < self.ledger.count:
+                self._remember(block.index, block)
+            else:
+                keep.append(block)
+        self._pending = keep
+
+class BinaryLedger:
+    """Binary ledger: ledger.dat holds length- and crc-prefixed JSON block records,
+    ledger.idx one fixed-size offset per block.
+
+    Both files are memory-mapped, so opening a ledger costs the same at any
+    height. Appends write and fsync the records first and the index entries
+    second; on open, index entries that point past the data are dropped and
+    unindexed trailing bytes are cut off. A missing index is rebuilt by
+    scanning the data file.
+    """
+
+    lazy = True
+    tiered = False
+
+    def __init__(self, data_path=LEDGER_DATA_FILE, index_path=LEDGER_INDEX_FILE):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.count = 0
+        self.chain = None
+        self._data_map = None
+        self._index_map = None
+
+    @staticmethod
+    def _encode(block_dict):
+        body = json.dumps(block_dict, separators=(',', ':')).encode('utf-8')
+        return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+    def _scan_data(self):
+        """Returns the offsets of the intact records in the data file"""
+        offsets = []
+        with open(self.data_path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + length
+            if end > len(data) or zlib.crc32(data[offset + RECORD_HEADER.size:end]) != checksum:
+                break
+            offsets.append(offset)
+            offset = end
+        return offsets
+
+    def _recover(self):
+        """Makes the index and data files agree, trimming any torn tail; returns the block count"""
+        if not os.path.exists(self.data_path):
+            _fsync_write(self.data_path, b'')
+        data_size = os.path.getsize(self.data_path)
+
+        if not os.path.exists(self.index_path):
+            offsets = self._scan_data()
+            print_warning(f"Rebuilt {os.path.basename(self.index_path)} ({len(offsets)} blocks)")
+            _fsync_write(self.index_path, b''.join(INDEX_ENTRY.pack(o) for o in offsets))
+
+        index_size = os.path.getsize(self.index_path)
+        count = index_size // INDEX_ENTRY.size
+        data_end = 0
+        with open(self.index_path, 'rb') as idx, open(self.data_path, 'rb') as data:
+            while count:
+                idx.seek((count - 1) * INDEX_ENTRY.size)
+                offset, = INDEX_ENTRY.unpack(idx.read(INDEX_ENTRY.size))
+                data.seek(offset)
+                header = data.read(RECORD_HEADER.size)
+                if len(header) == RECORD_HEADER.size:
+                    data_end = offset + RECORD_HEADER.size + RECORD_HEADER.unpack(header)[0]
+                    if data_end <= data_size:
+                        break
+                count -= 1
+            if not count:
+                data_end = 0
+
+        if count * INDEX_ENTRY.size != index_size or data_end != data_size:
+            print_warning(f"Torn write in {os.path.basename(self.data_path)}; truncating to block #{count - 1}")
+            for path, size in ((self.index_path, count * INDEX_ENTRY.size), (self.data_path, data_end)):
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+                    f.flush()
+                    os.fsync(f.fileno())
+        return count
+
+    @staticmethod
+    def _map_file(path):
+        if not os.path.getsize(path):
+            return None
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _map(self, count):
+        """(Re)maps both files after they grow, then publishes the new block count.
+
+        Old maps are not closed explicitly: readers on other threads may still
+        hold them, and they are released once the last reference goes.
+        """
+        self._data_map, self._index_map = self._map_file(self.data_path), self._map_file(self.index_path)
+        self.count = count
+
+    def open_chain(self, decode):
+        """Opens the ledger (converting ledger.json on first use) and returns a LazyChain"""
+        if not os.path.exists(self.data_path) and os.path.exists(LEDGER_FILE):
+            convert_json_ledger(data_path=self.data_path, index_path=self.index_path)
+        self._map(self._recover())
+        self.chain = LazyChain(self, decode)
+        print_info(f"Mapped {self.count} blocks from {os.path.basename(self.data_path)}")
+        return self.chain
+
+    def read(self, i):
+        """Decodes block i's record into a dict"""
+        index_map, data_map = self._index_map, self._data_map
+        offset, = INDEX_ENTRY.unpack_from(index_map, i * INDEX_ENTRY.size)
+        length, checksum = RECORD_HEADER.unpack_from(data_map, offset)
+        start = offset + RECORD_HEADER.size
+        body = data_map[start:start + length]
+        if zlib.crc32(body) != checksum:
+            raise ValueError(f"Checksum mismatch in ledger record #{i}")
+        return json.loads(body)
+
+    def append(self, block_dicts):
+        """Durably appends blocks: records first, then their index entries"""
+        records = [self._encode(d) for d in block_dicts]
+        with open(self.data_path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(b''.join(records))
+            f.flush()
+            os.fsync(f.fileno())
+        entries = []
+        for record in records:
+            entries.append(INDEX_ENTRY.pack(offset))
+            offset += len(record)
+        with open(self.index_path, 'ab') as f:
+            f.write(b''.join(entries))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._map(self.count + len(records))
+        if self.chain is not None:
+            self.chain._stored()
+
+    def needs_compaction(self):
+        return False # Appends are already in the final format
+
+    def rewrite(self, block_dicts):
+        """Writes the whole ledger anew.
+
+        The index is removed before the data file is replaced, so a crash in
+        between leaves a data file whose index is rebuilt on the next open.
+        """
+        records = [self._encode(d) for d in block_dicts]
+        offsets = []
+        offset = 0
+        for record in records:
+            offsets.append(INDEX_ENTRY.pack(offset))
+            offset += len(record)
+
+        _fsync_write(self.data_path + '.tmp', b''.join(records))
+        _fsync_write(self.index_path + '.tmp', b''.join(offsets))
+        # Drop our maps so the files can be replaced on platforms that lock mapped files
+        self._data_map = self._index_map = None
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        os.replace(self.data_path + '.tmp', self.data_path)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+        self._map(len(records))
+        if self.chain is not None:
+            self.chain._stored()
+
+def convert_json_ledger(snapshot_path=LEDGER_FILE, log_path=LEDGER_LOG_FILE, segment_dir=LEDGER_SEGMENT_DIR,
+                        data_path=LEDGER_DATA_FILE, index_path=LEDGER_INDEX_FILE):
+    """Converts the JSON ledger (cold segments, ledger.json and its append log) into the binary format"""
+    block_dicts = read_json_ledger(snapshot_path, log_path, segment_dir)
+    BinaryLedger(data_path, index_path).rewrite(block_dicts)
+    print_success(f"Converted {len(block_dicts)} blocks to {os.path.basename(data_path)}")
+    return len(block_dicts)
+
+if __name__ == "__main__":
+    set_reporter(ConsoleReporter())
+    convert_json_ledger()
@@ -0,0 +1,42 @@
+import os
+from infosec_banking.storage.ledger_log import encode_record, read_records, append_records
+from infosec_banking.config import MEMPOOL_LOG_FILE, MEMPOOL_LOG_COMPACT_EVERY
+
+class PendingLog:
+    """Write-ahead log of accepted transactions that are not yet in a block.
+
+    Each entry is appended and fsynced before its receipt is sent, in the
+    same checksummed line format as LedgerLog. Entries stay in the log after
+    they are mined; on load those are skipped, and the log is rewritten to
+    just the pending entries whenever the mempool drains or it holds
+    MEMPOOL_LOG_COMPACT_EVERY mined (stale) records.
+    """
+
+    def __init__(self, path=MEMPOOL_LOG_FILE, compact_every=MEMPOOL_LOG_COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self.records = 0
+
+    def load(self):
+        """Returns the logged (account_mask, encrypted_tx_hex, tx_hash) entries"""
+        entries = [tuple(record) for record in read_records(self.path)]
+        self.records = len(entries)
+        return entries
+
+    def append(self, entries):
+        append_records(self.path, [list(entry) for entry in entries])
+        self.records += len(entries)
+
+    def needs_compaction(self, pending):
+        """True once the mempool has drained or compact_every logged entries are no longer pending"""
+        return self.records > 0 and (not pending or self.records - pending >= self.compact_every)
+
+    def rewrite(self, entries):
+        """Atomically replaces the log with the given entries"""
+        path_tmp = self.path + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            f.write(b''.join(encode_record(list(entry)) for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path_tmp, self.path)
+        self.records = len(entries)
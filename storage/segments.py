@@ -0,0 +1,146 @@
+import bisect
+import os
+import threading
+from collections import OrderedDict
+from infosec_banking.storage.ledger_log import LedgerLog
+from infosec_banking.storage.storage_manager import StorageManager
+from infosec_banking.utils.colors import print_info, print_success
+from infosec_banking.config import LEDGER_SEGMENT_DIR, LEDGER_SEGMENT_CACHE, LEDGER_FILE, LEDGER_LOG_FILE
+
+class SegmentStore:
+    """Cold tier: sealed runs of old blocks in compressed, checksummed segment files.
+
+    manifest.json lists the segments in order with the block range and the
+    SHA-256 of each file. A segment is written and fsynced before the manifest
+    names it, so a crash mid-seal leaves at most an unreferenced file.
+    """
+
+    def __init__(self, directory=LEDGER_SEGMENT_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.segments = []
+        self.starts = []
+
+    def load(self):
+        """Reads the manifest; segments themselves are only opened when read"""
+        self.segments = []
+        if os.path.exists(self.manifest_path):
+            manifest = StorageManager.load_json(self.manifest_path, default_data={})
+            for segment in manifest.get('segments', []):
+                if segment['start'] != self.height:
+                    raise ValueError(f"Segment manifest gap at block #{self.height}")
+                self.segments.append(segment)
+        self.starts = [segment['start'] for segment in self.segments]
+        if self.segments:
+            print_info(f"{len(self.segments)} cold segment(s) hold blocks #0-#{self.height - 1}")
+
+    @property
+    def height(self):
+        """Number of blocks sealed into segments"""
+        return self.segments[-1]['end'] if self.segments else 0
+
+    def locate(self, index):
+        """Returns the position of the segment holding a block index"""
+        return bisect.bisect_right(self.starts, index) - 1
+
+    def read(self, position):
+        """Decompresses one segment and returns its block dicts"""
+        segment = self.segments[position]
+        block_dicts = StorageManager.read_segment(os.path.join(self.directory, segment['file']), segment['sha256'])
+        if len(block_dicts) != segment['end'] - segment['start'] or block_dicts[0]['index'] != segment['start']:
+            raise ValueError(f"Segment {segment['file']} does not hold blocks #{segment['start']}-#{segment['end'] - 1}")
+        return block_dicts
+
+    def seal(self, block_dicts):
+        """Writes the next run of blocks as a segment and records it in the manifest"""
+        start = self.height
+        if block_dicts[0]['index'] != start:
+            raise ValueError(f"Next segment must start at block #{start}")
+        end = start + len(block_dicts)
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"segment-{start:010d}-{end - 1:010d}.json.z"
+        checksum = StorageManager.write_segment(os.path.join(self.directory, name), block_dicts)
+
+        self.segments.append({'file': name, 'start': start, 'end': end, 'sha256': checksum})
+        self.starts.append(start)
+        StorageManager.atomic_write_json(self.manifest_path, {'segments': self.segments})
+        print_success(f"Sealed blocks #{start}-#{end - 1} into {name}")
+
+class TieredChain:
+    """Sequence of blocks split into sealed cold segments and an in-memory hot tail.
+
+    Cold blocks are decoded a whole segment at a time; the last few segments
+    read stay cached.
+    """
+
+    def __init__(self, segments, hot, decode, cache_size=LEDGER_SEGMENT_CACHE):
+        self.segments = segments
+        self._tiers = (segments.height, hot) # Swapped as one so readers never see a half-sealed view
+        self.decode = decode
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def cold_height(self):
+        return self._tiers[0]
+
+    @property
+    def hot(self):
+        return self._tiers[1]
+
+    def __len__(self):
+        cold_height, hot = self._tiers
+        return cold_height + len(hot)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("block index out of range")
+        cold_height, hot = self._tiers
+        if i >= cold_height:
+            return hot[i - cold_height]
+        position = self.segments.locate(i)
+        return self._segment_blocks(position)[i - self.segments.starts[position]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, block):
+        self.hot.append(block)
+
+    def _segment_blocks(self, position):
+        with self._cache_lock:
+            blocks = self._cache.get(position)
+            if blocks is not None:
+                self._cache.move_to_end(position)
+                return blocks
+        blocks = [self.decode(d) for d in self.segments.read(position)]
+        with self._cache_lock:
+            self._cache[position] = blocks
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return blocks
+
+    def seal(self, count):
+        """Moves the oldest `count` hot blocks into a new cold segment"""
+        hot = self.hot
+        self.segments.seal([block.to_dict() for block in hot[:count]])
+        self._tiers = (self.segments.height, hot[count:])
+
+def read_json_ledger(snapshot_path=LEDGER_FILE, log_path=LEDGER_LOG_FILE, segment_dir=LEDGER_SEGMENT_DIR):
+    """Returns every block of the JSON ledger: cold segments, ledger.json and its append log"""
+    segments = SegmentStore(segment_dir)
+    segments.load()
+    block_dicts = []
+    for position in range(len(segments.segments)):
+        block_dicts.extend(segments.read(position))
+    block_dicts.extend(LedgerLog(snapshot_path, log_path).load(start=segments.height))
+    return block_dicts
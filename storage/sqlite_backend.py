@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from infosec_banking.storage.backend import StorageBackend
+from infosec_banking.storage.segments import read_json_ledger
+from infosec_banking.storage.storage_manager import StorageManager
+from infosec_banking.utils.colors import print_info, print_success, set_reporter, ConsoleReporter
+from infosec_banking.config import SQLITE_DB_FILE, LEDGER_FILE
+
+class SqliteBackend(StorageBackend):
+    """Single SQLite database in WAL mode; each write is one short transaction.
+
+    Tables are created on first use. A table that is new while its JSON file
+    exists is filled from that file in the same step, so switching
+    STORAGE_BACKEND to 'sqlite' migrates existing data on the next start.
+    """
+
+    def __init__(self, path=SQLITE_DB_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection shared by all threads; self.lock serialises its use
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=FULL')
+        self.lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _create(self, name, columns, migrate):
+        """Creates a table if needed, running migrate(conn) in the same transaction"""
+        with self.transaction() as conn:
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone():
+                conn.execute(f'CREATE TABLE {name} ({columns})')
+                migrate(conn)
+
+    def open_table(self, name, json_path):
+        def migrate(conn):
+            if json_path and os.path.exists(json_path):
+                rows = StorageManager.load_json(json_path, default_data={})
+                _insert_rows(conn, name, rows)
+                print_success(f"Migrated {len(rows)} {name} rows from {os.path.basename(json_path)}")
+
+        self._create(name, 'key TEXT PRIMARY KEY, data TEXT NOT NULL', migrate)
+        return SqliteTable(self, name)
+
+    def open_ledger(self):
+        def migrate(conn):
+            if os.path.exists(LEDGER_FILE):
+                block_dicts = read_json_ledger()
+                _insert_blocks(conn, block_dicts)
+                print_success(f"Migrated {len(block_dicts)} blocks from {os.path.basename(LEDGER_FILE)}")
+
+        self._create('blocks', 'idx INTEGER PRIMARY KEY, data TEXT NOT NULL', migrate)
+        return SqliteLedger(self)
+
+def _insert_rows(conn, name, records):
+    conn.executemany(f'INSERT OR REPLACE INTO {name} (key, data) VALUES (?, ?)',
+                     [(key, json.dumps(record)) for key, record in records.items()])
+
+def _insert_blocks(conn, block_dicts):
+    conn.executemany('INSERT INTO blocks (idx, data) VALUES (?, ?)',
+                     [(d['index'], json.dumps(d, separators=(',', ':'))) for d in block_dicts])
+
+class SqliteTable:
+    """A keyed table of JSON records; writes touch only the rows given"""
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def load(self):
+        return {key: json.loads(data) for key, data in self.backend.query(f'SELECT key, data FROM {self.name}')}
+
+    def put(self, key, record):
+        self.put_many({key: record})
+
+    def put_many(self, records):
+        with self.backend.transaction() as conn:
+            _insert_rows(conn, self.name, records)
+
+    def delete(self, key):
+        with self.backend.transaction() as conn:
+            conn.execute(f'DELETE FROM {self.name} WHERE key = ?', (key,))
+
+class SqliteLedger:
+    """Block store on the 'blocks' table; the same interface as LedgerLog"""
+
+    lazy = False
+    tiered = False
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def load(self, start=0):
+        rows = self.backend.query('SELECT data FROM blocks WHERE idx >= ? ORDER BY idx', (start,))
+        return [json.loads(data) for data, in rows]
+
+    def append(self, block_dicts):
+        with self.backend.transaction() as conn:
+            _insert_blocks(conn, block_dicts)
+
+    def needs_compaction(self):
+        return False
+
+    def rewrite(self, block_dicts):
+        with self.backend.transaction() as conn:
+            conn.execute('DELETE FROM blocks')
+            _insert_blocks(conn, block_dicts)
+
+def migrate_json_to_sqlite(path=SQLITE_DB_FILE):
+    """Copies users, certificates and the ledger from the JSON files into a SQLite database"""
+    from infosec_banking.config import USERS_FILE
+    from infosec_banking.crypto.ca import CERT_STORE_FILE
+    backend = SqliteBackend(path)
+    backend.open_table('users', USERS_FILE)
+    backend.open_table('certificates', CERT_STORE_FILE)
+    backend.open_ledger()
+    print_info(f"SQLite store ready at {path}")
+
+if __name__ == "__main__":
+    set_reporter(ConsoleReporter())
+    migrate_json_to_sqlite()
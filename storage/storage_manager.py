@@ -1,8 +1,10 @@
+import hashlib
 import json
 import os
+import zlib
 import time
 import datetime
-from infosec_banking.utils.colors import print_processing, print_success, print_error, print_warning, print_info
+from infosec_banking.utils.colors import print_processing, print_success, print_error, print_warning, print_info, pause
 from infosec_banking.config import AUDIT_LOG_FILE
 
 class StorageManager:
@@ -62,7 +64,7 @@ class StorageManager:
         if os.path.exists(path):
             try:
                 print_processing(f"Loading {os.path.basename(path)}...")
-                time.sleep(0.1)
+                pause(0.1)
                 with open(path, 'r') as f:
                     data = json.load(f)
                 print_success(f"Loaded {os.path.basename(path)}")
@@ -83,6 +85,28 @@ class StorageManager:
         print_info(f"Initializing new {os.path.basename(path)}")
         return default_data if default_data is not None else {}
 
+    @staticmethod
+    def write_segment(path: str, records: list):
+        """Writes records as a compressed, read-only segment file; returns its SHA-256"""
+        data = zlib.compress(json.dumps(records, separators=(',', ':')).encode('utf-8'), 9)
+        path_tmp = path + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path_tmp, path)
+        os.chmod(path, 0o444) # Sealed segments are never rewritten
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def read_segment(path: str, checksum: str):
+        """Reads a segment file written by write_segment(), refusing it on checksum mismatch"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != checksum:
+            raise ValueError(f"Checksum mismatch in segment {os.path.basename(path)}")
+        return json.loads(zlib.decompress(data))
+
     @staticmethod
     def log_operation(user_id, action, status="SUCCESS"):
         """Writes to audit log"""
@@ -0,0 +1,25 @@
+import os
+import sys
+import pytest
+
+# Same layout as main.py: the repository directory is the infosec_banking package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Data paths in config are relative ('data/...'); keep tests away from the real ones"""
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def make_blocks():
+    """Returns blocks(start, count): minimal block dicts with indexes start..start+count-1"""
+    def blocks(start, count):
+        return [{"index": i, "hash": f"{i:064x}", "payload": "x" * i} for i in range(start, start + count)]
+    return blocks
+
+@pytest.fixture
+def make_entries():
+    """Returns entries(start, count): (account_mask, payload, tx_hash) mempool entries"""
+    def entries(start, count):
+        return [("Al***", f'{{"tx_id":"t{i}"}}', f"{i:064x}") for i in range(start, start + count)]
+    return entries
@@ -0,0 +1,18 @@
+from infosec_banking.models.account_state import AccountState
+from infosec_banking.models.block import Block
+
+def _chain(count):
+    chain, previous = [], "0" * 64
+    for i in range(count):
+        block = Block.from_entries(i, [("Al***", f'{{"tx_id":"t{i}","receiver_id":"bob","amount":10,"type":"deposit"}}', f"{i:064x}")], previous)
+        chain.append(block)
+        previous = block.hash
+    return chain
+
+def test_replay_stops_at_a_gap(tmp_path):
+    chain = _chain(4)
+    del chain[2] # A corrupt ledger record skipped on load
+    state = AccountState(str(tmp_path / "state.json"), opening_balance=0)
+    state.load(chain)
+    assert state.height == 2
+    assert state.balance("bob") == 20
@@ -0,0 +1,88 @@
+import os
+from infosec_banking.storage.binary_ledger import BinaryLedger, INDEX_ENTRY, convert_json_ledger
+from infosec_banking.storage.ledger_log import LedgerLog
+from infosec_banking.storage.segments import SegmentStore
+
+def _ledger(tmp_path):
+    return BinaryLedger(str(tmp_path / "ledger.dat"), str(tmp_path / "ledger.idx"))
+
+def _open(tmp_path):
+    ledger = _ledger(tmp_path)
+    chain = ledger.open_chain(lambda d: d)
+    return ledger, list(chain)
+
+def _write(tmp_path, blocks):
+    ledger = _ledger(tmp_path)
+    ledger.open_chain(lambda d: d)
+    ledger.append(blocks)
+    return ledger
+
+def test_append_and_reopen(tmp_path, make_blocks):
+    _write(tmp_path, make_blocks(0, 5))
+    ledger, chain = _open(tmp_path)
+    assert chain == make_blocks(0, 5)
+    assert ledger.count == 5
+
+def test_torn_record_without_index_entry_is_truncated(tmp_path, make_blocks):
+    ledger = _write(tmp_path, make_blocks(0, 3))
+    data_size = os.path.getsize(ledger.data_path)
+    with open(ledger.data_path, "ab") as f:
+        f.write(ledger._encode(make_blocks(3, 1)[0])[:-5]) # Crash before the record was complete
+
+    ledger, chain = _open(tmp_path)
+    assert chain == make_blocks(0, 3)
+    assert os.path.getsize(ledger.data_path) == data_size
+
+def test_index_entry_past_the_data_is_dropped(tmp_path, make_blocks):
+    ledger = _write(tmp_path, make_blocks(0, 3))
+    index_size = os.path.getsize(ledger.index_path)
+    with open(ledger.index_path, "ab") as f:
+        f.write(INDEX_ENTRY.pack(os.path.getsize(ledger.data_path))) # Index written, data lost
+        f.write(b"\x00\x01") # and a partial entry after it
+
+    ledger, chain = _open(tmp_path)
+    assert chain == make_blocks(0, 3)
+    assert os.path.getsize(ledger.index_path) == index_size
+
+def test_missing_index_is_rebuilt(tmp_path, make_blocks):
+    ledger = _write(tmp_path, make_blocks(0, 4))
+    with open(ledger.index_path, "rb") as f:
+        index = f.read()
+    os.remove(ledger.index_path)
+
+    ledger, chain = _open(tmp_path)
+    assert chain == make_blocks(0, 4)
+    with open(ledger.index_path, "rb") as f:
+        assert f.read() == index
+
+def test_missing_index_with_torn_data_tail(tmp_path, make_blocks):
+    ledger = _write(tmp_path, make_blocks(0, 2))
+    with open(ledger.data_path, "ab") as f:
+        f.write(ledger._encode(make_blocks(2, 1)[0])[:9])
+    os.remove(ledger.index_path)
+
+    ledger, chain = _open(tmp_path)
+    assert chain == make_blocks(0, 2)
+    ledger.append(make_blocks(2, 2))
+    assert _open(tmp_path)[1] == make_blocks(0, 4)
+
+def test_appends_after_recovery_continue_the_chain(tmp_path, make_blocks):
+    ledger = _write(tmp_path, make_blocks(0, 2))
+    with open(ledger.data_path, "ab") as f:
+        f.write(b"\xff" * 3)
+
+    ledger, _ = _open(tmp_path)
+    ledger.append(make_blocks(2, 3))
+    assert _open(tmp_path)[1] == make_blocks(0, 5)
+
+def test_conversion_includes_cold_segments(tmp_path, make_blocks):
+    segments = SegmentStore(str(tmp_path / "segments"))
+    segments.seal(make_blocks(0, 3))
+    segments.seal(make_blocks(3, 2))
+    json_ledger = LedgerLog(str(tmp_path / "ledger.json"), str(tmp_path / "ledger.log"))
+    json_ledger.rewrite(make_blocks(5, 2))
+    json_ledger.append(make_blocks(7, 1))
+
+    assert convert_json_ledger(json_ledger.snapshot_path, json_ledger.log_path, segments.directory,
+                               str(tmp_path / "ledger.dat"), str(tmp_path / "ledger.idx")) == 8
+    assert _open(tmp_path)[1] == make_blocks(0, 8)
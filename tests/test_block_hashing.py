@@ -0,0 +1,36 @@
+import pytest
+from infosec_banking.models.block import Block, hash_midstate, hash_with_nonce
+
+def _block(**overrides):
+    fields = dict(index=7, account_mask="Al***", encrypted_tx_hex="ab" * 40, tx_hash="cd" * 32,
+                  previous_hash="00" * 32, timestamp="2025-01-01T12:34:56.789012")
+    fields.update(overrides)
+    return Block(**fields)
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"account_mask": 'has "nonce":null inside'}, # The marker text inside a value is escaped
+    {"account_mask": "Zoë***"},
+    {"encrypted_tx_hex": '{"nonce": 5, "memo": "x"}'},
+    {"timestamp": 1735734896},
+    {"index": 0, "encrypted_tx_hex": ""},
+])
+@pytest.mark.parametrize("nonce", [0, 1, 9, 10, 12345, 2**40])
+def test_midstate_matches_compute_hash(overrides, nonce):
+    block = _block(**overrides)
+    state, suffix = hash_midstate(block.hash_fields())
+    block.nonce = nonce
+    assert hash_with_nonce(state, suffix, nonce) == block.compute_hash()
+
+def test_midstate_is_reusable_across_nonces():
+    block = _block()
+    state, suffix = hash_midstate(block.hash_fields())
+    for nonce in range(50):
+        block.nonce = nonce
+        assert hash_with_nonce(state, suffix, nonce) == block.compute_hash()
+
+def test_mined_hash_matches_compute_hash():
+    block = _block()
+    block.mine_block(2, workers=1)
+    assert block.hash == block.compute_hash()
+    assert block.hash.startswith("00")
@@ -0,0 +1,56 @@
+import os
+from infosec_banking.storage.ledger_log import LedgerLog, encode_record
+
+def _log(tmp_path):
+    return LedgerLog(str(tmp_path / "ledger.json"), str(tmp_path / "ledger.log"), compact_every=1000)
+
+def test_append_and_reload(tmp_path, make_blocks):
+    _log(tmp_path).append(make_blocks(0, 5))
+    assert _log(tmp_path).load() == make_blocks(0, 5)
+
+def test_torn_tail_without_newline_is_truncated(tmp_path, make_blocks):
+    log = _log(tmp_path)
+    log.append(make_blocks(0, 3))
+    good_size = os.path.getsize(log.log_path)
+    with open(log.log_path, "ab") as f:
+        f.write(encode_record(make_blocks(3, 1)[0])[:-7]) # Crash mid-record
+
+    assert _log(tmp_path).load() == make_blocks(0, 3)
+    assert os.path.getsize(log.log_path) == good_size
+
+def test_bad_checksum_drops_the_record_and_everything_after(tmp_path, make_blocks):
+    log = _log(tmp_path)
+    log.append(make_blocks(0, 4))
+    with open(log.log_path, "rb") as f:
+        lines = f.readlines()
+    lines[2] = b"00000000" + lines[2][8:]
+    with open(log.log_path, "wb") as f:
+        f.writelines(lines)
+
+    assert _log(tmp_path).load() == make_blocks(0, 2)
+    assert os.path.getsize(log.log_path) == len(lines[0]) + len(lines[1])
+
+def test_appends_after_recovery_continue_the_chain(tmp_path, make_blocks):
+    log = _log(tmp_path)
+    log.append(make_blocks(0, 2))
+    with open(log.log_path, "ab") as f:
+        f.write(b"1234")
+
+    log = _log(tmp_path)
+    assert log.load() == make_blocks(0, 2)
+    log.append(make_blocks(2, 2))
+    assert _log(tmp_path).load() == make_blocks(0, 4)
+
+def test_snapshot_plus_log_skips_already_compacted_records(tmp_path, make_blocks):
+    log = _log(tmp_path)
+    log.append(make_blocks(0, 3))
+    log.rewrite(make_blocks(0, 3))
+    log.append(make_blocks(3, 2))
+    # A crash between writing the snapshot and emptying the log leaves duplicates behind
+    with open(log.log_path, "rb") as f:
+        tail = f.read()
+    log.rewrite(make_blocks(0, 4))
+    with open(log.log_path, "wb") as f:
+        f.write(tail)
+
+    assert _log(tmp_path).load() == make_blocks(0, 5)
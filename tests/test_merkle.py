@@ -0,0 +1,25 @@
+from infosec_banking.models.block import Block
+
+ENTRIES = [("Al***", f'{{"tx_id":"t{i}","amount":10}}', f"{i:064x}") for i in range(3)]
+
+def _block():
+    block = Block.from_entries(1, ENTRIES, "00" * 32)
+    block.mine_block(1, workers=1)
+    return Block.from_dict(block.to_dict())
+
+def test_untouched_block_verifies():
+    assert _block().check("00" * 32, 1) is None
+
+def test_edited_payload_breaks_the_merkle_root():
+    block = _block()
+    transactions = block.transactions
+    transactions[0]["encrypted_tx_hex"] = transactions[0]["encrypted_tx_hex"].replace("10", "99999")
+    block.transactions = transactions
+    assert block.check("00" * 32, 1) == "Merkle root mismatch"
+
+def test_edited_mask_breaks_the_merkle_root():
+    block = _block()
+    transactions = block.transactions
+    transactions[1]["account_mask"] = "Ev***"
+    block.transactions = transactions
+    assert block.check("00" * 32, 1) == "Merkle root mismatch"
@@ -0,0 +1,69 @@
+import os
+import pytest
+from infosec_banking.storage.pending_log import PendingLog
+from infosec_banking.storage.ledger_log import encode_record
+
+def test_torn_tail_is_truncated(tmp_path, make_entries):
+    log = PendingLog(str(tmp_path / "mempool.log"))
+    log.append(make_entries(0, 3))
+    good_size = os.path.getsize(log.path)
+    with open(log.path, "ab") as f:
+        f.write(encode_record(list(make_entries(3, 1)[0]))[:-4])
+
+    log = PendingLog(str(tmp_path / "mempool.log"))
+    assert log.load() == make_entries(0, 3)
+    assert log.records == 3
+    assert os.path.getsize(log.path) == good_size
+
+def test_rewrite_keeps_only_the_given_entries(tmp_path, make_entries):
+    log = PendingLog(str(tmp_path / "mempool.log"), compact_every=4)
+    log.append(make_entries(0, 5))
+    assert not log.needs_compaction(pending=2) # Only 3 stale records
+    assert log.needs_compaction(pending=1)
+    log.rewrite(make_entries(4, 1))
+    assert not log.needs_compaction(pending=1)
+    assert PendingLog(log.path).load() == make_entries(4, 1)
+    assert log.needs_compaction(pending=0)
+
+def test_large_backlog_is_not_rewritten_per_block(tmp_path, make_entries):
+    log = PendingLog(str(tmp_path / "mempool.log"), compact_every=1000)
+    log.append(make_entries(0, 5000))
+    rewritten = []
+    for pending in range(4900, -1, -100): # Draining 100 entries per block
+        if log.needs_compaction(pending):
+            log.rewrite(make_entries(5000 - pending, pending))
+            rewritten.append(pending)
+    assert rewritten == [4000, 3000, 2000, 1000, 0]
+
+def test_blockchain_restores_unmined_entries(tmp_path, make_entries):
+    from infosec_banking.models.blockchain import Blockchain
+    os.makedirs("data")
+    chain = Blockchain(None, difficulty=1, mining_workers=1)
+    assert chain.submit_many(make_entries(0, 3)) == [True, True, True]
+
+    restarted = Blockchain(None, difficulty=1, mining_workers=1) # As if the process had crashed
+    assert restarted.mempool.entries() == make_entries(0, 3)
+    assert restarted.mine_pending(force=True).tx_count == 3
+
+    again = Blockchain(None, difficulty=1, mining_workers=1)
+    assert len(again.mempool) == 0
+    assert again.submit(*make_entries(1, 1)[0]) is False # Already on-chain
+
+def test_failed_mining_keeps_entries_pending(tmp_path, make_entries, monkeypatch):
+    from infosec_banking.models.block import Block
+    from infosec_banking.models.blockchain import Blockchain
+    os.makedirs("data")
+    chain = Blockchain(None, difficulty=1, mining_workers=1)
+    chain.submit_many(make_entries(0, 3))
+
+    def broken(self, difficulty, workers=None):
+        raise RuntimeError("miner crashed")
+    with monkeypatch.context() as patch:
+        patch.setattr(Block, "mine_block", broken)
+        with pytest.raises(RuntimeError):
+            chain.mine_pending(force=True)
+    assert chain.mempool.entries() == make_entries(0, 3)
+    assert chain.tx_status(make_entries(0, 1)[0][2]) == {"tx_status": "pending"}
+
+    assert chain.mine_pending(force=True).tx_count == 3
+    assert Blockchain(None, difficulty=1, mining_workers=1).height == 2
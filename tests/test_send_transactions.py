@@ -0,0 +1,35 @@
+import os
+import pytest
+from infosec_banking.crypto.signature import SignatureManager, ED25519
+from infosec_banking.models.transaction import Transaction
+
+@pytest.fixture
+def server():
+    from infosec_banking.core.server import BankingServer
+    os.makedirs("data")
+    server = BankingServer()
+    server.blockchain.difficulty = 1
+    yield server
+    server.server_socket.close()
+
+def _signed(server, tx_id, amount=10):
+    private_key, public_key = SignatureManager.generate_key_pair(ED25519)
+    cert = server.ca.issue_certificate("alice", public_key)
+    tx = Transaction(tx_id, cert, "bob", amount, "transfer", "rent")
+    tx.sign(private_key)
+    return tx.to_dict()
+
+def test_bad_entries_fail_only_their_own_position(server):
+    good = _signed(server, "tx-1")
+    system_deposit = Transaction("tx-2", "SYSTEM", "bob", 1000, "deposit", "gift").to_dict()
+    list_id = dict(_signed(server, "tx-3"), tx_id=["tx", 3])
+    unsigned = dict(_signed(server, "tx-4"), signature=None)
+
+    response = server.process_request({"action": "SEND_TRANSACTIONS",
+                                       "transactions": [good, system_deposit, list_id, unsigned, good]})
+    assert response["status"] == "success"
+    assert [result["status"] for result in response["results"]] == ["success", "error", "error", "error", "error"]
+    assert response["results"][0]["tx_status"] == "pending"
+    assert response["results"][4]["message"] == "Duplicate tx_id in batch"
+    assert (response["accepted"], response["rejected"]) == (1, 4)
+    assert len(server.blockchain.mempool) == 1
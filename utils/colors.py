@@ -1,3 +1,6 @@
+import time
+from collections import deque, namedtuple
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -8,21 +11,79 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
+    BLINK = '\033[5m'
+
+Event = namedtuple('Event', 'level text fields timestamp')
+
+class Reporter:
+    """Receives the progress events the core emits (header, processing, success, info, warning, error)"""
+
+    def emit(self, level, text, **fields):
+        raise NotImplementedError
+
+    def pause(self, seconds):
+        """Called where the console output paces itself; nothing else waits on it"""
+
+class HeadlessReporter(Reporter):
+    """Default: never prints or sleeps, and keeps the most recent events for inspection"""
+
+    def __init__(self, keep=256):
+        self.events = deque(maxlen=keep)
+
+    def emit(self, level, text, end=None, **fields): # end is a console layout hint
+        self.events.append(Event(level, text, fields, time.time()))
+
+class ConsoleReporter(Reporter):
+    """The coloured terminal output, pauses included; opted into by the interactive entry points"""
+
+    FORMATS = {
+        'success': Colors.GREEN + '[OK] {}' + Colors.ENDC,
+        'error': Colors.RED + '[X] {}' + Colors.ENDC,
+        'info': Colors.BLUE + '[i] {}' + Colors.ENDC,
+        'warning': Colors.YELLOW + '[!] {}' + Colors.ENDC,
+        'processing': Colors.CYAN + '[*] {}' + Colors.ENDC,
+    }
+
+    def emit(self, level, text, end="\n", **fields):
+        if level == 'header':
+            print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}\n{text.center(70)}\n{'='*70}{Colors.ENDC}\n")
+        else:
+            print(self.FORMATS[level].format(text), end=end, flush=True)
+
+    def pause(self, seconds):
+        time.sleep(seconds)
+
+_reporter = HeadlessReporter()
+
+def set_reporter(reporter):
+    """Installs the process-wide reporter and returns the previous one"""
+    global _reporter
+    previous, _reporter = _reporter, reporter
+    return previous
+
+def get_reporter():
+    return _reporter
+
+def report(level, text, **fields):
+    _reporter.emit(level, text, **fields)
+
+def pause(seconds):
+    _reporter.pause(seconds)
 
 def print_header(text):
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}\n{text.center(70)}\n{'='*70}{Colors.ENDC}\n")
+    report('header', text)
 
-def print_success(text):
-    print(f"{Colors.GREEN}[OK] {text}{Colors.ENDC}")
+def print_success(text, **fields):
+    report('success', text, **fields)
 
-def print_error(text):
-    print(f"{Colors.RED}[X] {text}{Colors.ENDC}")
+def print_error(text, **fields):
+    report('error', text, **fields)
 
-def print_info(text):
-    print(f"{Colors.BLUE}[i] {text}{Colors.ENDC}")
+def print_info(text, **fields):
+    report('info', text, **fields)
 
-def print_warning(text):
-    print(f"{Colors.YELLOW}[!] {text}{Colors.ENDC}")
+def print_warning(text, **fields):
+    report('warning', text, **fields)
 
-def print_processing(text, end="\r"):
-    print(f"{Colors.CYAN}[*] {text}{Colors.ENDC}", end=end, flush=True)
+def print_processing(text, end="\r", **fields):
+    report('processing', text, end=end, **fields)
@@ -0,0 +1,30 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+def worker_context():
+    """Multiprocessing context for worker pools: forkserver, or spawn where that is missing.
+
+    Pools are started from server threads while other threads may hold locks
+    (key caches, the chain and mempool locks). A plain fork copies those locks
+    in their held state and the child can deadlock on them.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(workers):
+    """Returns the shared process pool with this many workers, starting it on first use"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=worker_context())
+        return pool
+
+@atexit.register
+def _shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)